@@ -3,8 +3,13 @@ from rest_framework import serializers
 class CompileRequestSerializer(serializers.Serializer):
     source = serializers.CharField()
     persist = serializers.BooleanField(required=False, default=False)
+    include_ast = serializers.BooleanField(required=False, default=False)
+    include_typed_ast = serializers.BooleanField(required=False, default=False)
+    include_ir = serializers.BooleanField(required=False, default=False)
 
 class CompileResponseSerializer(serializers.Serializer):
+    # Schema/documentation only: CompileView writes the result dict directly
+    # and never calls .data on this.
     stage_logs = serializers.ListField(child=serializers.CharField())
     errors = serializers.ListField(child=serializers.DictField(), required=False)
 
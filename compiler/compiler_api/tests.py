@@ -1,3 +1,30 @@
+import json
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+
+class CompileViewTests(TestCase):
+    def test_int_beyond_64_bits_with_ast_sections(self):
+        resp = self.client.post(reverse('compile'), {
+            'source': 'int x = 99999999999999999999; print(x);',
+            'include_ast': True,
+            'include_typed_ast': True,
+        }, content_type='application/json')
+        self.assertEqual(resp.status_code, 200)
+        body = json.loads(resp.content)
+        self.assertEqual(body['ast']['body'][0]['init']['value'], 99999999999999999999)
+        self.assertIn('typed_ast', body)
+
+    def test_inf_float_with_int_beyond_64_bits_is_valid_json(self):
+        resp = self.client.post(reverse('compile'), {
+            'source': 'float a = 1' + '0' * 400 + '.0; int b = 1' + '0' * 30 + ';',
+            'include_ast': True,
+            'include_typed_ast': True,
+        }, content_type='application/json')
+        self.assertEqual(resp.status_code, 200)
+
+        def reject(token):
+            raise ValueError(f'not JSON: {token}')
+        body = json.loads(resp.content, parse_constant=reject)
+        self.assertIsNone(body['ast']['body'][0]['init']['value'])
+        self.assertEqual(body['ast']['body'][1]['init']['value'], 10 ** 30)
@@ -1,7 +1,8 @@
+from django.http import HttpResponse
 from rest_framework.views import APIView
-from rest_framework.response import Response
 from rest_framework import status
-from .serializers import CompileRequestSerializer, CompileResponseSerializer
+from .serializers import CompileRequestSerializer
+from compiler_core.encoding import dumps_json
 from compiler_core.services.compiler_service import CompilerService
 
 
@@ -9,10 +10,14 @@ class CompileView(APIView):
     def post(self, request):
         req_ser = CompileRequestSerializer(data=request.data)
         req_ser.is_valid(raise_exception=True)
-        source = req_ser.validated_data['source']
-        persist = req_ser.validated_data['persist']
+        data = req_ser.validated_data
+        source = data['source']
+        persist = data['persist']
 
 
-        result = CompilerService().compile(source, persist=persist)
-        res_ser = CompileResponseSerializer(result)
-        return Response(res_ser.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        result = CompilerService().compile(source, persist=persist,
+                                           include_ast=data['include_ast'],
+                                           include_typed_ast=data['include_typed_ast'],
+                                           include_ir=data['include_ir'])
+        # result is already JSON-shaped; CompileResponseSerializer only documents it
+        return HttpResponse(dumps_json(result), content_type='application/json', status=status.HTTP_200_OK)
\ No newline at end of file
@@ -16,25 +16,29 @@ class Command(BaseCommand):
             src = f.read()
 
         service = CompilerService()
-        result = service.compile(src, persist=options.get('persist', False))
-
-        self.stdout.write(self.style.SUCCESS('=== STAGE LOGS ==='))
-        for line in result['stage_logs']:
-            self.stdout.write(line)
+        # the CLI prints every stage
+        result = service.compile(src, persist=options.get('persist', False),
+                                 include_ast=True, include_typed_ast=True, include_ir=True)
 
         def section(title):
             self.stdout.write(self.style.SUCCESS(f'\n=== {title} ==='))
 
+        def lines(items):
+            # one write per section instead of one per line
+            if items:
+                self.stdout.write('\n'.join(items))
+
+        self.stdout.write(self.style.SUCCESS('=== STAGE LOGS ==='))
+        lines(result['stage_logs'])
+
         section('ERRORS')
         if result.get('errors'):
-            for e in result['errors']:
-                self.stdout.write(f"Line {e.get('line')}:{e.get('col')} - {e.get('message')}")
+            lines([f"Line {e.get('line')}:{e.get('col')} - {e.get('message')}" for e in result['errors']])
         else:
             self.stdout.write('No errors')
 
         section('TOKENS')
-        for t in result['tokens'][:200]:
-            self.stdout.write(str(t))
+        lines(list(map(str, result['tokens'][:200])))
 
         section('AST (parser JSON)')
         self.stdout.write(str(result['ast']))
@@ -46,20 +50,16 @@ class Command(BaseCommand):
         self.stdout.write(str(result['symbol_table']))
 
         section('IR (before opt)')
-        for x in result['ir']:
-            self.stdout.write(x)
+        lines(result['ir'])
 
         section('IR (after opt)')
-        for x in result['ir_optimized']:
-            self.stdout.write(x)
+        lines(result['ir_optimized'])
 
         section('BYTECODE (before peephole)')
-        for x in result['bytecode']:
-            self.stdout.write(x)
+        lines(result['bytecode'])
 
         section('BYTECODE (after peephole)')
-        for x in result['bytecode_optimized']:
-            self.stdout.write(x)
+        lines(result['bytecode_optimized'])
 
         section('PROGRAM OUTPUT')
         self.stdout.write(result['output'])
\ No newline at end of file
@@ -1,26 +1,35 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional, Any, Dict
+from typing import Callable, List, Optional, Any, Dict, Tuple
 
 # === AST NODES ===
 
-class Node: ...
-class Stmt(Node): ...
+# slots everywhere: no per-node __dict__ (bases declare theirs too, otherwise
+# subclasses would still get one)
+class Node:
+    __slots__ = ()
+
+class Stmt(Node):
+    __slots__ = ()
+
 class Expr(Node):
-    inferred_type: str | None = None  # set by semantics
+    __slots__ = ('inferred_type',)  # set by semantics
+
+    def __post_init__(self):
+        self.inferred_type: str | None = None
 
 # Program
-@dataclass
+@dataclass(slots=True)
 class Program(Node):
     body: List[Stmt]
 
 # Functions
-@dataclass
+@dataclass(slots=True)
 class Param(Node):
     type: str
     name: str
 
-@dataclass
+@dataclass(slots=True)
 class FunctionDecl(Stmt):
     return_type: str
     name: str
@@ -28,11 +37,11 @@ class FunctionDecl(Stmt):
     body: 'Block'
 
 # Statements
-@dataclass
+@dataclass(slots=True)
 class Block(Stmt):
     statements: List[Stmt]
 
-@dataclass
+@dataclass(slots=True)
 class VarDecl(Stmt):
     var_type: str
     name: str
@@ -40,160 +49,203 @@ class VarDecl(Stmt):
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class If(Stmt):
     cond: Expr
     then_branch: Stmt
     else_branch: Optional[Stmt]
 
-@dataclass
+@dataclass(slots=True)
 class While(Stmt):
     cond: Expr
     body: Stmt
 
-@dataclass
+@dataclass(slots=True)
 class For(Stmt):
     init: Optional[Stmt]
     cond: Optional[Expr]
     post: Optional[Stmt]
     body: Stmt
 
-@dataclass
+@dataclass(slots=True)
 class Print(Stmt):
     expr: Expr
 
-@dataclass
+@dataclass(slots=True)
 class Return(Stmt):
     expr: Optional[Expr]
 
-@dataclass
+@dataclass(slots=True)
 class ExprStmt(Stmt):
     expr: Expr
 
 # Expressions
-@dataclass
+@dataclass(slots=True)
 class Assign(Expr):
     name: str
     value: Expr
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class Call(Expr):
     name: str
     args: List[Expr]
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class Literal(Expr):
     value: Any
     kind: str  # 'int' | 'float' | 'bool'
 
-@dataclass
+    def __post_init__(self):
+        # a literal's type is its kind, known at construction
+        self.inferred_type = self.kind
+
+@dataclass(slots=True)
 class Var(Expr):
     name: str
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class Unary(Expr):
     op: str
     right: Expr
 
-@dataclass
+@dataclass(slots=True)
 class Binary(Expr):
     left: Expr
     op: str
     right: Expr
 
-@dataclass
+@dataclass(slots=True)
 class Grouping(Expr):
     expr: Expr
 
 # === JSON helpers ===
+# One builder per node class, looked up by exact type in _AST_TO_DICT. A builder
+# returns the node's dict with child slots set to None and pushes each child
+# with the (container, key) slot it has to fill; _to_dict drains that stack.
+
+Push = Callable[[Tuple[Node, Any, Any]], None]
+
+def _list(nodes: List[Node], push: Push) -> List[Any]:
+    items: List[Any] = [None] * len(nodes)
+    for i, child in enumerate(nodes):
+        push((child, items, i))
+    return items
+
+def _opt(d: Dict[str, Any], key: str, child: Optional[Node], push: Push) -> Dict[str, Any]:
+    if child is not None:
+        push((child, d, key))
+    return d
+
+def _program(n: Program, push: Push):
+    return {"type": "Program", "body": _list(n.body, push)}
+
+def _function_decl(n: FunctionDecl, push: Push):
+    d = {"type": "FunctionDecl", "return_type": n.return_type, "name": n.name,
+         "params": [{"type": p.type, "name": p.name} for p in n.params], "body": None}
+    push((n.body, d, "body"))
+    return d
+
+def _block(n: Block, push: Push):
+    return {"type": "Block", "statements": _list(n.statements, push)}
+
+def _var_decl(n: VarDecl, push: Push):
+    return _opt({"type": "VarDecl", "var_type": n.var_type, "name": n.name, "init": None, "line": n.line, "col": n.col}, "init", n.init, push)
+
+def _if(n: If, push: Push):
+    d = {"type": "If", "cond": None, "then": None, "else": None}
+    push((n.cond, d, "cond")); push((n.then_branch, d, "then"))
+    return _opt(d, "else", n.else_branch, push)
+
+def _while(n: While, push: Push):
+    d = {"type": "While", "cond": None, "body": None}
+    push((n.cond, d, "cond")); push((n.body, d, "body"))
+    return d
+
+def _for(n: For, push: Push):
+    d = {"type": "For", "init": None, "cond": None, "post": None, "body": None}
+    _opt(d, "init", n.init, push); _opt(d, "cond", n.cond, push); _opt(d, "post", n.post, push)
+    push((n.body, d, "body"))
+    return d
+
+def _print(n: Print, push: Push):
+    d = {"type": "Print", "expr": None}
+    push((n.expr, d, "expr"))
+    return d
+
+def _return(n: Return, push: Push):
+    return _opt({"type": "Return", "expr": None}, "expr", n.expr, push)
+
+def _expr_stmt(n: ExprStmt, push: Push):
+    d = {"type": "ExprStmt", "expr": None}
+    push((n.expr, d, "expr"))
+    return d
+
+def _assign(n: Assign, push: Push):
+    d = {"type": "Assign", "name": n.name, "value": None, "line": n.line, "col": n.col}
+    push((n.value, d, "value"))
+    return d
+
+def _call(n: Call, push: Push):
+    return {"type": "Call", "name": n.name, "args": _list(n.args, push), "line": n.line, "col": n.col}
+
+def _literal(n: Literal, push: Push):
+    return {"type": "Literal", "value": n.value, "kind": n.kind}
+
+def _var(n: Var, push: Push):
+    return {"type": "Var", "name": n.name, "line": n.line, "col": n.col}
+
+def _unary(n: Unary, push: Push):
+    d = {"type": "Unary", "op": n.op, "right": None}
+    push((n.right, d, "right"))
+    return d
+
+def _binary(n: Binary, push: Push):
+    d = {"type": "Binary", "op": n.op, "left": None, "right": None}
+    push((n.left, d, "left")); push((n.right, d, "right"))
+    return d
+
+def _grouping(n: Grouping, push: Push):
+    d = {"type": "Grouping", "expr": None}
+    push((n.expr, d, "expr"))
+    return d
+
+_AST_TO_DICT: Dict[type, Callable[[Any, Push], Dict[str, Any]]] = {
+    Program: _program, FunctionDecl: _function_decl, Block: _block, VarDecl: _var_decl,
+    If: _if, While: _while, For: _for, Print: _print, Return: _return, ExprStmt: _expr_stmt,
+    Assign: _assign, Call: _call, Literal: _literal, Var: _var,
+    Unary: _unary, Binary: _binary, Grouping: _grouping,
+}
+
+
+def _to_dict(root: Node, typed: bool) -> Dict[str, Any]:
+    # Iterative, so arbitrarily deep expressions never hit the recursion limit.
+    holder: List[Any] = [None]
+    stack: List[Tuple[Node, Any, Any]] = [(root, holder, 0)]
+    pop = stack.pop
+    push = stack.append
+    builder_of = _AST_TO_DICT.get
+    while stack:
+        node, parent, key = pop()
+        build = builder_of(type(node))
+        if build is None:
+            raise TypeError(f"Unknown node type: {type(node)}")
+        d = build(node, push)
+        if typed and isinstance(node, Expr):
+            d["inferred"] = node.inferred_type
+        parent[key] = d
+    return holder[0]
+
 
 def ast_to_dict(node: Node) -> Dict[str, Any]:
-    if isinstance(node, Program):
-        return {"type": "Program", "body": [ast_to_dict(s) for s in node.body]}
-    if isinstance(node, FunctionDecl):
-        return {
-            "type": "FunctionDecl",
-            "return_type": node.return_type,
-            "name": node.name,
-            "params": [{"type": p.type, "name": p.name} for p in node.params],
-            "body": ast_to_dict(node.body),
-        }
-    if isinstance(node, Block):
-        return {"type": "Block", "statements": [ast_to_dict(s) for s in node.statements]}
-    if isinstance(node, VarDecl):
-        return {"type": "VarDecl", "var_type": node.var_type, "name": node.name, "init": ast_to_dict(node.init) if node.init else None, "line": node.line, "col": node.col}
-    if isinstance(node, If):
-        return {"type": "If", "cond": ast_to_dict(node.cond), "then": ast_to_dict(node.then_branch), "else": ast_to_dict(node.else_branch) if node.else_branch else None}
-    if isinstance(node, While):
-        return {"type": "While", "cond": ast_to_dict(node.cond), "body": ast_to_dict(node.body)}
-    if isinstance(node, For):
-        return {"type": "For", "init": ast_to_dict(node.init) if node.init else None, "cond": ast_to_dict(node.cond) if node.cond else None, "post": ast_to_dict(node.post) if node.post else None, "body": ast_to_dict(node.body)}
-    if isinstance(node, Print):
-        return {"type": "Print", "expr": ast_to_dict(node.expr)}
-    if isinstance(node, Return):
-        return {"type": "Return", "expr": ast_to_dict(node.expr) if node.expr else None}
-    if isinstance(node, ExprStmt):
-        return {"type": "ExprStmt", "expr": ast_to_dict(node.expr)}
-    if isinstance(node, Assign):
-        return {"type": "Assign", "name": node.name, "value": ast_to_dict(node.value), "line": node.line, "col": node.col}
-    if isinstance(node, Call):
-        return {"type": "Call", "name": node.name, "args": [ast_to_dict(a) for a in node.args], "line": node.line, "col": node.col}
-    if isinstance(node, Literal):
-        return {"type": "Literal", "value": node.value, "kind": node.kind}
-    if isinstance(node, Var):
-        return {"type": "Var", "name": node.name, "line": node.line, "col": node.col}
-    if isinstance(node, Unary):
-        return {"type": "Unary", "op": node.op, "right": ast_to_dict(node.right)}
-    if isinstance(node, Binary):
-        return {"type": "Binary", "op": node.op, "left": ast_to_dict(node.left), "right": ast_to_dict(node.right)}
-    if isinstance(node, Grouping):
-        return {"type": "Grouping", "expr": ast_to_dict(node.expr)}
-    raise TypeError(f"Unknown node type: {type(node)}")
+    return _to_dict(node, False)
 
 
 def typed_ast_to_dict(node: Node) -> Dict[str, Any]:
-    base = ast_to_dict(node)
-    if isinstance(node, Expr):
-        base["inferred"] = getattr(node, "inferred_type", None)
-    if isinstance(node, Program):
-        base["body"] = [typed_ast_to_dict(s) for s in node.body]
-    elif isinstance(node, FunctionDecl):
-        base["body"] = typed_ast_to_dict(node.body)
-    elif isinstance(node, Block):
-        base["statements"] = [typed_ast_to_dict(s) for s in node.statements]
-    elif isinstance(node, If):
-        base["cond"] = typed_ast_to_dict(node.cond)
-        base["then"] = typed_ast_to_dict(node.then_branch)
-        if node.else_branch: base["else"] = typed_ast_to_dict(node.else_branch)
-    elif isinstance(node, While):
-        base["cond"] = typed_ast_to_dict(node.cond)
-        base["body"] = typed_ast_to_dict(node.body)
-    elif isinstance(node, For):
-        if node.init: base["init"] = typed_ast_to_dict(node.init)
-        if node.cond: base["cond"] = typed_ast_to_dict(node.cond)
-        if node.post: base["post"] = typed_ast_to_dict(node.post)
-        base["body"] = typed_ast_to_dict(node.body)
-    elif isinstance(node, Print):
-        base["expr"] = typed_ast_to_dict(node.expr)
-    elif isinstance(node, Return) and node.expr is not None:
-        base["expr"] = typed_ast_to_dict(node.expr)
-    elif isinstance(node, ExprStmt):
-        base["expr"] = typed_ast_to_dict(node.expr)
-    elif isinstance(node, Assign):
-        base["value"] = typed_ast_to_dict(node.value)
-    elif isinstance(node, Call):
-        base["args"] = [typed_ast_to_dict(a) for a in node.args]
-    elif isinstance(node, Unary):
-        base["right"] = typed_ast_to_dict(node.right)
-    elif isinstance(node, Binary):
-        base["left"] = typed_ast_to_dict(node.left)
-        base["right"] = typed_ast_to_dict(node.right)
-    elif isinstance(node, Grouping):
-        base["expr"] = typed_ast_to_dict(node.expr)
-    return base
\ No newline at end of file
+    """Like ast_to_dict, plus an "inferred" key on every expression."""
+    return _to_dict(node, True)
@@ -1,58 +1,66 @@
 from __future__ import annotations
+import sys
 from dataclasses import dataclass
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
-@dataclass
+@dataclass(slots=True)
 class Symbol:
     name: str
     type: str  # 'int' | 'float' | 'bool'
+    depth: int = 0  # scope level the symbol was defined at
 
-class Scope:
-    def __init__(self, parent: Optional['Scope']=None):
-        self.parent = parent
-        self.symbols: Dict[str, Symbol] = {}
-
-    def define(self, name: str, type_: str) -> bool:
-        if name in self.symbols:
-            return False
-        self.symbols[name] = Symbol(name, type_)
-        return True
+class SymbolTable:
+    """Scoped symbol table, stored flat.
 
-    def resolve(self, name: str) -> Optional[Symbol]:
-        scope: Optional['Scope'] = self
-        while scope is not None:
-            if name in scope.symbols:
-                return scope.symbols[name]
-            scope = scope.parent
-        return None
+    `table` maps every visible name to its innermost definition, so
+    `resolve` is a single dict lookup. Each `define` appends
+    ``(new symbol, symbol it shadows)`` to the `undo` trail, and
+    `scope_marks` holds the trail length at each `push_scope`; `pop_scope`
+    replays the trail back to the mark, restoring shadowed names. Opening a
+    scope allocates nothing.
+    """
+    __slots__ = ('table', 'undo', 'scope_marks')
 
-class SymbolTable:
     def __init__(self):
-        self.scopes: List[Scope] = []
+        self.table: Dict[str, Symbol] = {}
+        self.undo: List[Tuple[Symbol, Optional[Symbol]]] = []
+        self.scope_marks: List[int] = []
         self.push_scope()  # global scope
 
     def push_scope(self):
-        parent = self.scopes[-1] if self.scopes else None
-        self.scopes.append(Scope(parent))
+        self.scope_marks.append(len(self.undo))
 
     def pop_scope(self):
-        if self.scopes:
-            self.scopes.pop()
-
-    def current(self) -> Scope:
-        return self.scopes[-1]
+        if self.scope_marks:
+            mark = self.scope_marks.pop()
+            table, undo = self.table, self.undo
+            while len(undo) > mark:
+                sym, prior = undo.pop()
+                if prior is None:
+                    del table[sym.name]
+                else:
+                    table[sym.name] = prior
 
     def define(self, name: str, type_: str) -> bool:
-        return self.current().define(name, type_)
+        name = sys.intern(name)
+        depth = len(self.scope_marks) - 1
+        prior = self.table.get(name)
+        if prior is not None and prior.depth == depth:
+            return False  # already defined in this scope
+        sym = self.table[name] = Symbol(name, type_, depth)
+        self.undo.append((sym, prior))
+        return True
 
     def resolve(self, name: str) -> Optional[Symbol]:
-        return self.current().resolve(name)
+        return self.table.get(name)
 
     def to_json(self):
         arr = []
-        for idx, scope in enumerate(self.scopes):
+        undo, marks = self.undo, self.scope_marks
+        for idx, start in enumerate(marks):
+            end = marks[idx + 1] if idx + 1 < len(marks) else len(undo)
             arr.append({
                 'level': idx,
-                'symbols': {k: v.type for k, v in scope.symbols.items()}
+                'symbols': {sym.name: sym.type for sym, _ in undo[start:end]}
             })
-        return {'scopes': arr}
\ No newline at end of file
+        return {'scopes': arr}
@@ -37,7 +37,7 @@ KEYWORDS = {
     'false': TokenType.BOOL_LIT,
 }
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     type: TokenType
     lexeme: str
@@ -0,0 +1,26 @@
+import json
+import math
+from typing import Any
+import orjson
+
+
+def _finite(obj: Any) -> Any:
+    # orjson writes inf/nan as null; do the same before the stdlib encoder,
+    # which would emit the non-JSON tokens Infinity/NaN
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
+
+
+def dumps_json(obj: Any) -> bytes:
+    # int literals are unbounded but orjson only encodes 64-bit integers;
+    # on overflow fall back to the stdlib encoder, which writes them as numbers
+    try:
+        return orjson.dumps(obj)
+    except orjson.JSONEncodeError:
+        return json.dumps(_finite(obj), ensure_ascii=False, allow_nan=False,
+                          separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-15 18:10
+
+from django.db import migrations, models
+
+
+def encode_existing(apps, schema_editor):
+    # rows written by the JSONField come back as JSON text; store them as bytes
+    CompilationRun = apps.get_model("compiler_core", "CompilationRun")
+    for pk, value in CompilationRun.objects.values_list("pk", "result_json"):
+        if isinstance(value, str):
+            CompilationRun.objects.filter(pk=pk).update(result_json=value.encode("utf-8"))
+
+
+def decode_existing(apps, schema_editor):
+    # BinaryField will not write text, so put the JSON back with raw SQL
+    CompilationRun = apps.get_model("compiler_core", "CompilationRun")
+    table = schema_editor.quote_name(CompilationRun._meta.db_table)
+    for pk, value in CompilationRun.objects.values_list("pk", "result_json"):
+        if not isinstance(value, str):
+            schema_editor.execute(f"UPDATE {table} SET result_json = %s WHERE id = %s",
+                                  [bytes(value).decode("utf-8"), pk])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("compiler_core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="compilationrun",
+            name="result_json",
+            field=models.BinaryField(),
+        ),
+        migrations.RunPython(encode_existing, decode_existing),
+    ]
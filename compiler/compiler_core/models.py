@@ -4,7 +4,7 @@ from django.db import models
 class CompilationRun(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     source = models.TextField()
-    result_json = models.JSONField()
+    result_json = models.BinaryField()  # orjson-encoded compile result
 
 
 class Meta:
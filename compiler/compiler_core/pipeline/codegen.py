@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Callable, ClassVar, Dict, List, Optional
 
 from .ir import (
     IRInstr, Label as IRLabel, Goto as IRGoto, IfFalse as IRIfFalse,
@@ -9,91 +9,120 @@ from .ir import (
 )
 
 # ---- Bytecode ----
+# slots=True: no per-instance __dict__, and __str__ concatenates instead of
+# formatting since it runs once per instruction when results are rendered.
 
-@dataclass
-class BCInstr: ...
+# Opcode ids, one per instruction class (op_id); the VM dispatches on them
+# through a handler table indexed by opcode.
+(OP_LABEL, OP_JMP, OP_IFFALSE, OP_MOV, OP_UNARY, OP_BIN,
+ OP_PRINT, OP_RET, OP_FUNC, OP_ENDFUNC, OP_CALL, OP_IFTRUE) = range(12)
 
-@dataclass
+@dataclass(slots=True)
+class BCInstr:
+    op_id: ClassVar[int]
+
+@dataclass(slots=True)
 class BLabel(BCInstr):
+    op_id = OP_LABEL
     name: str
-    def __str__(self): return f"{self.name}:"
+    def __str__(self): return self.name + ":"
 
-@dataclass
+@dataclass(slots=True)
 class BJmp(BCInstr):
+    op_id = OP_JMP
     label: str
-    def __str__(self): return f"JMP {self.label}"
+    def __str__(self): return "JMP " + self.label
 
-@dataclass
+@dataclass(slots=True)
 class BIfFalse(BCInstr):
+    op_id = OP_IFFALSE
+    cond: str
+    label: str
+    def __str__(self): return "".join(("IFFALSE ", self.cond, " ", self.label))
+
+# only produced by the peephole pass (IFFALSE over JMP), never from IR
+@dataclass(slots=True)
+class BIfTrue(BCInstr):
+    op_id = OP_IFTRUE
     cond: str
     label: str
-    def __str__(self): return f"IFFALSE {self.cond} {self.label}"
+    def __str__(self): return "".join(("IFTRUE ", self.cond, " ", self.label))
 
-@dataclass
+@dataclass(slots=True)
 class BMov(BCInstr):
+    op_id = OP_MOV
     dst: str; src: str
-    def __str__(self): return f"MOV {self.dst}, {self.src}"
+    def __str__(self): return "".join(("MOV ", self.dst, ", ", self.src))
 
-@dataclass
+@dataclass(slots=True)
 class BUnary(BCInstr):
+    op_id = OP_UNARY
     dst: str; op: str; src: str
-    def __str__(self): return f"UNARY {self.dst}, {self.op}, {self.src}"
+    def __str__(self): return "".join(("UNARY ", self.dst, ", ", self.op, ", ", self.src))
 
-@dataclass
+@dataclass(slots=True)
 class BBin(BCInstr):
+    op_id = OP_BIN
     dst: str; op: str; left: str; right: str
-    def __str__(self): return f"BIN {self.dst}, {self.op}, {self.left}, {self.right}"
+    def __str__(self): return "".join(("BIN ", self.dst, ", ", self.op, ", ", self.left, ", ", self.right))
 
-@dataclass
+@dataclass(slots=True)
 class BPrint(BCInstr):
+    op_id = OP_PRINT
     value: str
-    def __str__(self): return f"PRINT {self.value}"
+    def __str__(self): return "PRINT " + self.value
 
-@dataclass
+@dataclass(slots=True)
 class BRet(BCInstr):
+    op_id = OP_RET
     value: Optional[str]
-    def __str__(self): return f"RET {self.value if self.value is not None else ''}".rstrip()
+    def __str__(self): return "RET" if self.value is None else "RET " + self.value
 
-@dataclass
+@dataclass(slots=True)
 class BFunc(BCInstr):
+    op_id = OP_FUNC
     name: str
     params: List[str]
-    def __str__(self): return f"FUNC {self.name}({', '.join(self.params)})"
+    def __str__(self): return "".join(("FUNC ", self.name, "(", ", ".join(self.params), ")"))
 
-@dataclass
+@dataclass(slots=True)
 class BEndFunc(BCInstr):
+    op_id = OP_ENDFUNC
     name: str
-    def __str__(self): return f"ENDFUNC {self.name}"
+    def __str__(self): return "ENDFUNC " + self.name
 
-@dataclass
+@dataclass(slots=True)
 class BCall(BCInstr):
+    op_id = OP_CALL
     dst: Optional[str]
     name: str
     args: List[str]
     def __str__(self):
         dst = self.dst if self.dst is not None else '_'
-        return f"CALL {dst} = {self.name}({', '.join(self.args)})"
+        return "".join(("CALL ", dst, " = ", self.name, "(", ", ".join(self.args), ")"))
 
 Bytecode = List[BCInstr]
 
-class Codegen:
-    def __init__(self): self.out: Bytecode = []
-    def emit(self, ins: BCInstr): self.out.append(ins)
+# exact IR type -> bytecode factory; one dict hit per instruction
+_CONVERT: Dict[type, Callable[[IRInstr], BCInstr]] = {
+    IRLabel: lambda i: BLabel(i.name),
+    IRGoto: lambda i: BJmp(i.label),
+    IRIfFalse: lambda i: BIfFalse(i.cond, i.label),
+    IRAssign: lambda i: BMov(i.dst, i.src),
+    IRUnary: lambda i: BUnary(i.dst, i.op, i.operand),
+    IRBin: lambda i: BBin(i.dst, i.op, i.left, i.right),
+    IRPrint: lambda i: BPrint(i.value),
+    IRReturn: lambda i: BRet(i.value),
+    IRFuncStart: lambda i: BFunc(i.name, i.params),
+    IRFuncEnd: lambda i: BEndFunc(i.name),
+    IRCall: lambda i: BCall(i.dst, i.name, i.args),
+}
 
+class Codegen:
     def gen(self, ir: List[IRInstr]) -> Bytecode:
-        for ins in ir:
-            if isinstance(ins, IRLabel): self.emit(BLabel(ins.name))
-            elif isinstance(ins, IRGoto): self.emit(BJmp(ins.label))
-            elif isinstance(ins, IRIfFalse): self.emit(BIfFalse(ins.cond, ins.label))
-            elif isinstance(ins, IRAssign): self.emit(BMov(ins.dst, ins.src))
-            elif isinstance(ins, IRUnary): self.emit(BUnary(ins.dst, ins.op, ins.operand))
-            elif isinstance(ins, IRBin): self.emit(BBin(ins.dst, ins.op, ins.left, ins.right))
-            elif isinstance(ins, IRPrint): self.emit(BPrint(ins.value))
-            elif isinstance(ins, IRReturn): self.emit(BRet(ins.value))
-            elif isinstance(ins, IRFuncStart): self.emit(BFunc(ins.name, ins.params))
-            elif isinstance(ins, IRFuncEnd): self.emit(BEndFunc(ins.name))
-            elif isinstance(ins, IRCall): self.emit(BCall(ins.dst, ins.name, ins.args))
-        return self.out
+        get = _CONVERT.get
+        # instructions with no bytecode form are skipped, as before
+        return [conv(ins) for ins in ir if (conv := get(type(ins))) is not None]
 
 # API
 
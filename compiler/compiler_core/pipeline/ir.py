@@ -1,6 +1,8 @@
 from __future__ import annotations
+import sys
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from compiler_core.domain.ast_nodes import (
     Program, Block, VarDecl, If, While, For, Print, Return, ExprStmt,
@@ -10,79 +12,101 @@ from compiler_core.domain.ast_nodes import (
 
 # ---- IR instructions ----
 
-@dataclass
-class IRInstr: ...
+class IRInstr(ABC):
+    # Instructions are immutable once built, so each renders its text once
+    # (subclasses implement _format) and __str__ reuses it; optimized IR
+    # shares most instruction objects with the unoptimized listing.
+    __slots__ = ('_str',)
 
-@dataclass
+    def __str__(self) -> str:
+        try:
+            return self._str
+        except AttributeError:
+            text = self._format()
+            object.__setattr__(self, '_str', text)  # frozen subclasses
+            return text
+
+    @abstractmethod
+    def _format(self) -> str: ...
+
+@dataclass(frozen=True, slots=True)
 class Label(IRInstr):
     name: str
-    def __str__(self): return f"{self.name}:"
+    def _format(self): return f"{self.name}:"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Goto(IRInstr):
     label: str
-    def __str__(self): return f"goto {self.label}"
+    def _format(self): return f"goto {self.label}"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class IfFalse(IRInstr):
     cond: str
     label: str
-    def __str__(self): return f"iffalse {self.cond} goto {self.label}"
+    def _format(self): return f"iffalse {self.cond} goto {self.label}"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AssignInstr(IRInstr):
     dst: str
     src: str
-    def __str__(self): return f"{self.dst} = {self.src}"
+    def _format(self): return f"{self.dst} = {self.src}"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BinOp(IRInstr):
     dst: str
     op: str
     left: str
     right: str
-    def __str__(self): return f"{self.dst} = {self.left} {self.op} {self.right}"
+    def _format(self): return f"{self.dst} = {self.left} {self.op} {self.right}"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UnaryOp(IRInstr):
     dst: str
     op: str
     operand: str
-    def __str__(self): return f"{self.dst} = {self.op}{self.operand}"
+    def _format(self): return f"{self.dst} = {self.op}{self.operand}"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PrintInstr(IRInstr):
     value: str
-    def __str__(self): return f"print {self.value}"
+    def _format(self): return f"print {self.value}"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ReturnInstr(IRInstr):
     value: Optional[str]
-    def __str__(self): return f"return {self.value if self.value is not None else ''}".rstrip()
+    def _format(self): return f"return {self.value if self.value is not None else ''}".rstrip()
 
 # functions
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FuncStart(IRInstr):
     name: str
     params: List[str]
-    def __str__(self): return f"func {self.name}({', '.join(self.params)})"
+    def _format(self): return f"func {self.name}({', '.join(self.params)})"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FuncEnd(IRInstr):
     name: str
-    def __str__(self): return f"endfunc {self.name}"
+    def _format(self): return f"endfunc {self.name}"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CallInstr(IRInstr):
     dst: Optional[str]
     name: str
     args: List[str]
-    def __str__(self):
+    def _format(self):
         dst = self.dst if self.dst is not None else '_'
         return f"call {dst} = {self.name}({', '.join(self.args)})"
 
 IR = List[IRInstr]
 
+# Temp and label names come from pools of interned strings instead of being
+# formatted per call; later passes key dicts on them and hit identity-equal
+# strings. Temps t1..t4096 are built at import, bigger programs fall back to
+# formatting. Label names are pooled per base as they are first used
+# (setdefault keeps concurrent compiles consistent).
+_TEMP_POOL = tuple(sys.intern(f"t{i}") for i in range(1, 4097))
+_LABEL_POOLS: Dict[str, Dict[int, str]] = {}
+
 class IRBuilder:
     def __init__(self):
         self.code: IR = []
@@ -90,11 +114,25 @@ class IRBuilder:
         self.label_counter = 0
 
     def emit(self, i: IRInstr): self.code.append(i)
-    def new_temp(self) -> str: self.temp_counter += 1; return f"t{self.temp_counter}"
-    def new_label(self, base: str = 'L') -> str: self.label_counter += 1; return f"{base}{self.label_counter}"
+    def new_temp(self) -> str:
+        self.temp_counter = i = self.temp_counter + 1
+        return _TEMP_POOL[i - 1] if i <= len(_TEMP_POOL) else sys.intern(f"t{i}")
+
+    def new_label(self, base: str = 'L') -> str:
+        self.label_counter = i = self.label_counter + 1
+        pool = _LABEL_POOLS.get(base)
+        if pool is None:
+            pool = _LABEL_POOLS.setdefault(base, {})
+        name = pool.get(i)
+        if name is None:
+            name = pool.setdefault(i, sys.intern(f"{base}{i}"))
+        return name
 
     # expr
     def gen_expr(self, e: Expr) -> str:
+        # Grouping only records parentheses (kept for the AST JSON); it
+        # generates nothing, so unwrap it here rather than recursing per layer
+        while type(e) is Grouping: e = e.expr
         if isinstance(e, Literal):
             if e.kind == 'bool': return '1' if bool(e.value) else '0'
             return str(e.value)
@@ -105,10 +143,9 @@ class IRBuilder:
             t = self.new_temp(); self.emit(UnaryOp(t, e.op, self.gen_expr(e.right))); return t
         if isinstance(e, Binary):
             t = self.new_temp(); self.emit(BinOp(t, e.op, self.gen_expr(e.left), self.gen_expr(e.right))); return t
-        if isinstance(e, Grouping): return self.gen_expr(e.expr)
         if isinstance(e, Call):
             # if inferred void -> dst None, else temp
-            dst = None if getattr(e, 'inferred_type', None) == 'void' else self.new_temp()
+            dst = None if e.inferred_type == 'void' else self.new_temp()
             args = [self.gen_expr(a) for a in e.args]
             self.emit(CallInstr(dst, e.name, args))
             return '0' if dst is None else dst
@@ -118,8 +155,9 @@ class IRBuilder:
     def gen_stmt(self, s: Stmt):
         if isinstance(s, Block):
             # PATCH: Remove 'return' after the for loop, so all statements are processed
+            gen_stmt = self.gen_stmt
             for st in s.statements:
-                self.gen_stmt(st)
+                gen_stmt(st)
             return
         if isinstance(s, VarDecl):
             if s.init is not None:
@@ -181,7 +219,8 @@ class IRBuilder:
         # else ignore
 
     def gen(self, root: Program) -> IR:
-        for s in root.body: self.gen_stmt(s)
+        gen_stmt = self.gen_stmt
+        for s in root.body: gen_stmt(s)
         return self.code
 
 # API
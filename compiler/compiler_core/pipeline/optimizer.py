@@ -1,29 +1,38 @@
 from __future__ import annotations
-import re
-from typing import List, Optional, Union
+import operator
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
-from .ir import IRInstr, Label, Goto, IfFalse, AssignInstr, BinOp, UnaryOp, PrintInstr, ReturnInstr
-
-TEMP_RE = re.compile(r"^t\d+$")
+from .ir import (
+    IRInstr, Label, Goto, IfFalse, AssignInstr, BinOp, UnaryOp, PrintInstr, ReturnInstr,
+    FuncStart, FuncEnd, CallInstr,
+)
 
 # ---------- Utility: constant evaluation ----------
 
+# Operand string -> its numeric value (None for names). A program only has a
+# handful of distinct operands, so every float() parse after the first one is
+# a dict hit. Cleared wholesale when full to stay bounded in the service.
+_CONST_CACHE: Dict[str, Optional[float]] = {}
+_CONST_CACHE_MAX = 4096
+
+
 def is_const(x: str) -> bool:
-    if x is None: return False
-    try:
-        float(x)
-        return True
-    except Exception:
-        return x in ('0', '1')  # bools are already 0/1
+    return const_val(x) is not None
 
 
 def const_val(x: str) -> Optional[float]:
     try:
-        return float(x)
+        return _CONST_CACHE[x]
+    except KeyError:
+        pass
+    try:
+        v = float(x)  # bools are already 0/1
     except Exception:
-        if x in ('0', '1'):
-            return float(x)
-        return None
+        v = None
+    if len(_CONST_CACHE) >= _CONST_CACHE_MAX:
+        _CONST_CACHE.clear()
+    _CONST_CACHE[x] = v
+    return v
 
 
 def fmt_num(x: float) -> str:
@@ -84,49 +93,82 @@ def eval_unary(op: str, a: str) -> Optional[str]:
 
 
 def is_temp(name: str) -> bool:
-    return isinstance(name, str) and TEMP_RE.match(name) is not None
+    # temporaries are t<digits>, see IRBuilder.new_temp
+    return isinstance(name, str) and len(name) > 1 and name[0] == 't' and name[1:].isdigit()
 
 # ---------- Pass 1: Constant folding & algebraic simplifications ----------
 
+# Algebraic identities as (op, left, right, rewrite) rows, first match wins.
+# An operand pattern is _ZERO, _ONE (a constant with that value) or _ANY, and
+# the rewrite builds the replacement from (dst, left, right).
+_ANY, _ZERO, _ONE = 0, 1, 2
+_CLASS = {0.0: _ZERO, 1.0: _ONE}  # const value -> pattern, anything else _ANY
+
+_Rewrite = Callable[[str, str, str], IRInstr]
+_LEFT: _Rewrite = lambda d, l, r: AssignInstr(d, l)
+_RIGHT: _Rewrite = lambda d, l, r: AssignInstr(d, r)
+_ZERO_RESULT: _Rewrite = lambda d, l, r: AssignInstr(d, '0')
+_NEG_RIGHT: _Rewrite = lambda d, l, r: UnaryOp(d, '-', r)
+
+_IDENTITY_RULES: Tuple[Tuple[str, int, int, _Rewrite], ...] = (
+    # x + 0, x - 0, x * 1, x / 1, x * 0, 0 * x
+    ('+', _ANY, _ZERO, _LEFT),
+    ('-', _ANY, _ZERO, _LEFT),
+    ('*', _ANY, _ONE, _LEFT),
+    ('/', _ANY, _ONE, _LEFT),
+    ('*', _ANY, _ZERO, _ZERO_RESULT),
+    ('*', _ZERO, _ANY, _ZERO_RESULT),
+    # left-constant forms: 0 + x, 1 * x, 0 - x
+    ('+', _ZERO, _ANY, _RIGHT),
+    ('*', _ONE, _ANY, _RIGHT),
+    ('-', _ZERO, _ANY, _NEG_RIGHT),
+)
+
+# (op, left class, right class) -> rewrite, expanded from the rows above so
+# fold() does one dict lookup however many identities there are
+_IDENTITIES: Dict[Tuple[str, int, int], _Rewrite] = {}
+for _op, _lp, _rp, _rewrite in _IDENTITY_RULES:
+    for _lc in (_ANY, _ZERO, _ONE):
+        for _rc in (_ANY, _ZERO, _ONE):
+            if _lp in (_ANY, _lc) and _rp in (_ANY, _rc):
+                _IDENTITIES.setdefault((_op, _lc, _rc), _rewrite)
+
+# x op x -> constant. x / x is left alone (x may be 0 at run time), and so
+# are && / || (x && x is 0/1, not x, when x is not a bool).
+_SAME_OPERAND = {'-': '0', '==': '1', '<=': '1', '>=': '1', '!=': '0', '<': '0', '>': '0'}
+
+
+def fold(ins: IRInstr) -> IRInstr:
+    """Folds one instruction; returns `ins` itself when nothing applies."""
+    if isinstance(ins, BinOp):
+        op = ins.op
+        lv, rv = const_val(ins.left), const_val(ins.right)
+        if lv is not None and rv is not None:
+            val = eval_bin(op, ins.left, ins.right)
+            if val is not None:
+                return AssignInstr(ins.dst, val)
+        # algebraic identities
+        rewrite = _IDENTITIES.get((op, _CLASS.get(lv, _ANY), _CLASS.get(rv, _ANY)))
+        if rewrite is not None:
+            return rewrite(ins.dst, ins.left, ins.right)
+        # same operand on both sides (like x * 0 above, assumes no NaN/inf)
+        if ins.left == ins.right:
+            val = _SAME_OPERAND.get(op)
+            if val is not None:
+                return AssignInstr(ins.dst, val)
+        return ins
+    if isinstance(ins, UnaryOp):
+        if const_val(ins.operand) is not None:
+            val = eval_unary(ins.op, ins.operand)
+            if val is not None:
+                return AssignInstr(ins.dst, val)
+        return ins
+    # other instructions unchanged
+    return ins
+
+
 def constant_fold(ir: List[IRInstr]) -> List[IRInstr]:
-    out: List[IRInstr] = []
-    for ins in ir:
-        if isinstance(ins, BinOp):
-            # algebraic identities
-            if is_const(ins.left) and is_const(ins.right):
-                val = eval_bin(ins.op, ins.left, ins.right)
-                if val is not None:
-                    out.append(AssignInstr(ins.dst, val))
-                    continue
-            # x + 0, x - 0, x * 1, x / 1, x * 0, 0 * x
-            if ins.op in ('+', '-') and is_const(ins.right) and const_val(ins.right) == 0:
-                out.append(AssignInstr(ins.dst, ins.left))
-                continue
-            if ins.op == '*' and is_const(ins.right) and const_val(ins.right) == 1:
-                out.append(AssignInstr(ins.dst, ins.left))
-                continue
-            if ins.op == '/' and is_const(ins.right) and const_val(ins.right) == 1:
-                out.append(AssignInstr(ins.dst, ins.left))
-                continue
-            if ins.op == '*' and is_const(ins.right) and const_val(ins.right) == 0:
-                out.append(AssignInstr(ins.dst, '0'))
-                continue
-            if ins.op == '*' and is_const(ins.left) and const_val(ins.left) == 0:
-                out.append(AssignInstr(ins.dst, '0'))
-                continue
-            out.append(ins)
-            continue
-        if isinstance(ins, UnaryOp):
-            if is_const(ins.operand):
-                val = eval_unary(ins.op, ins.operand)
-                if val is not None:
-                    out.append(AssignInstr(ins.dst, val))
-                    continue
-            out.append(ins)
-            continue
-        # other instructions unchanged
-        out.append(ins)
-    return out
+    return [fold(ins) for ins in ir]
 
 # ---------- Pass 2: Dead code elimination (temporaries) ----------
 
@@ -143,6 +185,8 @@ def used_vars(ins: IRInstr) -> List[str]:
         return [ins.value]
     if isinstance(ins, ReturnInstr) and ins.value is not None:
         return [ins.value]
+    if isinstance(ins, CallInstr):
+        return list(ins.args)
     return []
 
 
@@ -184,9 +228,103 @@ def dce(ir: List[IRInstr]) -> List[IRInstr]:
     out_rev.reverse()
     return out_rev
 
+# ---------- Pass 3: Copy propagation ----------
+
+def _propagate(ins: IRInstr, copies: Dict[str, str]) -> IRInstr:
+    # rewrite the operands `ins` reads; allocate only if one changes
+    get = copies.get
+    if isinstance(ins, BinOp):
+        left, right = get(ins.left, ins.left), get(ins.right, ins.right)
+        if left is not ins.left or right is not ins.right:
+            return BinOp(ins.dst, ins.op, left, right)
+    elif isinstance(ins, UnaryOp):
+        operand = get(ins.operand, ins.operand)
+        if operand is not ins.operand:
+            return UnaryOp(ins.dst, ins.op, operand)
+    elif isinstance(ins, AssignInstr):
+        src = get(ins.src, ins.src)
+        if src is not ins.src:
+            return AssignInstr(ins.dst, src)
+    elif isinstance(ins, IfFalse):
+        cond = get(ins.cond, ins.cond)
+        if cond is not ins.cond:
+            return IfFalse(cond, ins.label)
+    elif isinstance(ins, PrintInstr):
+        value = get(ins.value, ins.value)
+        if value is not ins.value:
+            return PrintInstr(value)
+    elif isinstance(ins, ReturnInstr):
+        if ins.value is not None:
+            value = get(ins.value, ins.value)
+            if value is not ins.value:
+                return ReturnInstr(value)
+    elif isinstance(ins, CallInstr):
+        args = [get(a, a) for a in ins.args]
+        if any(a is not b for a, b in zip(args, ins.args)):
+            return CallInstr(ins.dst, ins.name, args)
+    return ins
+
+
+def copy_propagate(ir: List[IRInstr]) -> List[IRInstr]:
+    """Forward pass replacing reads of `dst` after `dst = src` with `src`.
+
+    Copies are forgotten at labels and function boundaries (join points),
+    when either side is reassigned, and, for user variables, at calls. The
+    copies themselves stay; DCE drops the ones that became dead.
+    """
+    copies: Dict[str, str] = {}
+    out: List[IRInstr] = []
+    for ins in ir:
+        if copies:
+            ins = _propagate(ins, copies)
+        if isinstance(ins, (Label, FuncStart, FuncEnd)):
+            copies.clear()
+        elif isinstance(ins, CallInstr):
+            for k in [k for k, v in copies.items()
+                      if not is_temp(k) or not (is_temp(v) or is_const(v))]:
+                del copies[k]
+        d = ins.dst if isinstance(ins, (AssignInstr, BinOp, UnaryOp, CallInstr)) else None
+        if d is not None and copies:
+            copies.pop(d, None)
+            for k in [k for k, v in copies.items() if v == d]:
+                del copies[k]
+        if isinstance(ins, AssignInstr) and ins.src != ins.dst:
+            copies[ins.dst] = ins.src
+        out.append(ins)
+    return out
+
+# ---------- Fused pass: folding + DCE in one backward walk ----------
+
+def cf_dce(ir: List[IRInstr]) -> List[IRInstr]:
+    """constant_fold and dce in a single backward walk.
+
+    Each instruction is folded as it is reached, then kept or dropped on
+    the live set. Unlike `dce`, a dropped instruction does not make its
+    operands live, so a whole chain of dead temporaries goes in one walk.
+    """
+    live: set[str] = set()
+    out_rev: List[IRInstr] = []
+    for ins in reversed(ir):
+        ins = fold(ins)
+        d = defined_var(ins)
+        if d is not None and d not in live and not has_side_effect(ins):
+            continue
+        out_rev.append(ins)
+        for u in used_vars(ins):
+            if isinstance(u, str) and not is_const(u):
+                live.add(u)
+        if d is not None and d in live:
+            live.remove(d)
+    out_rev.reverse()
+    return out_rev
+
 # ---------- Driver ----------
 
 def optimize_ir(ir: List[IRInstr]) -> List[IRInstr]:
-    ir1 = constant_fold(ir)
-    ir2 = dce(ir1)
-    return ir2
\ No newline at end of file
+    # Iterate to a fixed point: a pass that changes nothing returns the very
+    # same instruction objects (fold() only allocates when it rewrites).
+    while True:
+        out = cf_dce(copy_propagate(ir))
+        if len(out) == len(ir) and all(map(operator.is_, out, ir)):
+            return out
+        ir = out
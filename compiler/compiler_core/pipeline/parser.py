@@ -1,4 +1,5 @@
 from __future__ import annotations
+import sys
 from typing import List, Optional, Tuple
 
 from compiler_core.domain.tokens import Token, TokenType
@@ -9,15 +10,61 @@ from compiler_core.domain.ast_nodes import (
 )
 from compiler_core.domain.errors import ParseError
 
+# TokenType members bound to module globals: a LOAD_GLOBAL instead of
+# LOAD_GLOBAL TokenType + enum attribute lookup on every parser decision
+(
+    _KW_INT, _KW_FLOAT, _KW_BOOL, _KW_VOID, _KW_IF, _KW_ELSE,
+    _KW_WHILE, _KW_FOR, _KW_RETURN, _KW_PRINT, _IDENT, _INT_LIT,
+    _FLOAT_LIT, _BOOL_LIT, _LPAREN, _RPAREN, _LBRACE, _RBRACE,
+    _COMMA, _SEMI, _ASSIGN, _OR, _AND, _EQ,
+    _NE, _LT, _LE, _GT, _GE, _PLUS,
+    _MINUS, _STAR, _SLASH, _PERCENT, _BANG, _EOF,
+) = (
+    TokenType.KW_INT, TokenType.KW_FLOAT, TokenType.KW_BOOL, TokenType.KW_VOID, TokenType.KW_IF,
+    TokenType.KW_ELSE, TokenType.KW_WHILE, TokenType.KW_FOR, TokenType.KW_RETURN, TokenType.KW_PRINT,
+    TokenType.IDENT, TokenType.INT_LIT, TokenType.FLOAT_LIT, TokenType.BOOL_LIT, TokenType.LPAREN,
+    TokenType.RPAREN, TokenType.LBRACE, TokenType.RBRACE, TokenType.COMMA, TokenType.SEMI,
+    TokenType.ASSIGN, TokenType.OR, TokenType.AND, TokenType.EQ, TokenType.NE,
+    TokenType.LT, TokenType.LE, TokenType.GT, TokenType.GE, TokenType.PLUS,
+    TokenType.MINUS, TokenType.STAR, TokenType.SLASH, TokenType.PERCENT, TokenType.BANG,
+    TokenType.EOF,
+)
+
+_PARAM_TYPES = frozenset((_KW_INT, _KW_FLOAT, _KW_BOOL))
+_DECL_TYPES = _PARAM_TYPES | {_KW_VOID}
+
+# tokens that start a new statement (or close a block): error recovery stops there
+_SYNC_STOP = frozenset((
+    _KW_IF, _KW_WHILE, _KW_FOR,
+    _KW_RETURN, _KW_INT, _KW_FLOAT,
+    _KW_BOOL, _KW_VOID, _RBRACE,
+))
+
+# binary operator -> (left binding power, right binding power, op); all left-associative
+_BP = {
+    _OR: (1, 2, '||'),
+    _AND: (3, 4, '&&'),
+    _EQ: (5, 6, '=='), _NE: (5, 6, '!='),
+    _LT: (7, 8, '<'), _LE: (7, 8, '<='),
+    _GT: (7, 8, '>'), _GE: (7, 8, '>='),
+    _PLUS: (9, 10, '+'), _MINUS: (9, 10, '-'),
+    _STAR: (11, 12, '*'), _SLASH: (11, 12, '/'), _PERCENT: (11, 12, '%'),
+}
+
 class Parser:
+    __slots__ = ('tokens', 'types', 'current', 'errors')
+
     def __init__(self, tokens: List[Token]):
         self.tokens = tokens
+        # token types as a parallel column: decisions index it directly
+        # instead of loading .type off a Token each time
+        self.types = [t.type for t in tokens]
         self.current = 0
         self.errors: List[ParseError] = []
 
     # -------------- utilities --------------
     def _at_end(self) -> bool:
-        return self._peek().type == TokenType.EOF
+        return self.types[self.current] is _EOF
 
     def _peek(self) -> Token:
         return self.tokens[self.current]
@@ -26,12 +73,15 @@ class Parser:
         return self.tokens[self.current - 1]
 
     def _advance(self) -> Token:
-        if not self._at_end():
-            self.current += 1
-        return self._previous()
+        i = self.current
+        if self.types[i] is _EOF:
+            return self.tokens[i - 1]
+        self.current = i + 1
+        return self.tokens[i]
 
     def _check(self, *types: TokenType) -> bool:
-        return (not self._at_end()) and (self._peek().type in types)
+        t = self.types[self.current]
+        return t is not _EOF and t in types
 
     def _match(self, *types: TokenType) -> bool:
         if self._check(*types):
@@ -39,8 +89,19 @@ class Parser:
             return True
         return False
 
+    # single-type fast paths: no varargs tuple, no _at_end() detour
+    # (EOF is always last, so a non-EOF type can never match at the end)
+    def _check1(self, ttype: TokenType) -> bool:
+        return self.types[self.current] is ttype
+
+    def _match1(self, ttype: TokenType) -> bool:
+        if self.types[self.current] is ttype:
+            self.current += 1
+            return True
+        return False
+
     def _consume(self, ttype: TokenType, msg: str) -> Token:
-        if self._check(ttype):
+        if self.types[self.current] is ttype:
             return self._advance()
         self._error(self._peek(), msg)
         return self._advance()
@@ -50,19 +111,18 @@ class Parser:
         self._synchronize()
 
     def _synchronize(self):
-        self._advance()
-        while not self._at_end():
-            if self._previous().type == TokenType.SEMI:
-                return
-            if self._peek().type in (
-                TokenType.KW_IF, TokenType.KW_WHILE, TokenType.KW_FOR,
-                TokenType.KW_RETURN, TokenType.KW_INT, TokenType.KW_FLOAT,
-                TokenType.KW_BOOL, TokenType.KW_VOID
-            ):
-                return
-            if self._peek().type == TokenType.RBRACE:
-                return
-            self._advance()
+        types = self.types
+        i = self.current
+        if types[i] is not _EOF:
+            i += 1
+        while True:
+            t = types[i]
+            if t is _EOF or types[i - 1] is _SEMI:
+                break
+            if t in _SYNC_STOP:
+                break
+            i += 1
+        self.current = i
 
     # -------------- entrypoint --------------
     def parse(self) -> Tuple[Program, List[ParseError]]:
@@ -73,124 +133,141 @@ class Parser:
 
     # -------------- declarations --------------
     def declaration(self) -> Stmt:
-        if self._match(TokenType.KW_INT, TokenType.KW_FLOAT, TokenType.KW_BOOL, TokenType.KW_VOID):
-            type_tok = self._previous()
-            name_tok = self._consume(TokenType.IDENT, "Expected identifier after type")
-            if self._match(TokenType.LPAREN):
+        if self.types[self.current] in _DECL_TYPES:
+            type_tok = self._advance()
+            name_tok = self._consume(_IDENT, "Expected identifier after type")
+            if self._match1(_LPAREN):
                 # --- function declaration ---
                 params = self.param_list()
-                self._consume(TokenType.RPAREN, "Expected ')' after parameters")
-                self._consume(TokenType.LBRACE, "Expected '{' before function body")
+                self._consume(_RPAREN, "Expected ')' after parameters")
+                self._consume(_LBRACE, "Expected '{' before function body")
                 body = self.block()  # block() now handles both cases safely
                 return FunctionDecl(return_type=type_tok.lexeme, name=name_tok.lexeme, params=params, body=body)
             # --- variable declaration ---
-            if type_tok.type == TokenType.KW_VOID:
+            if type_tok.type == _KW_VOID:
                 self._error(type_tok, "'void' is not allowed for variable declarations")
             init: Optional[Expr] = None
-            if self._match(TokenType.ASSIGN):
+            if self._match1(_ASSIGN):
                 init = self.expression()
-            self._consume(TokenType.SEMI, "Expected ';' after declaration")
+            self._consume(_SEMI, "Expected ';' after declaration")
             return VarDecl(var_type=type_tok.lexeme, name=name_tok.lexeme, init=init, line=type_tok.line, col=type_tok.col)
         return self.statement()
 
     def param_list(self) -> List[Param]:
+        tokens = self.tokens
+        types = self.types
         params: List[Param] = []
-        if self._check(TokenType.RPAREN):
+        if types[self.current] is _RPAREN:
             return params
         while True:
-            if not self._match(TokenType.KW_INT, TokenType.KW_FLOAT, TokenType.KW_BOOL):
-                self._error(self._peek(), "Expected parameter type (int|float|bool)")
+            type_tok = tokens[self.current]
+            if type_tok.type not in _PARAM_TYPES:
+                self._error(type_tok, "Expected parameter type (int|float|bool)")
                 break
-            ttype_tok = self._previous()
-            name_tok = self._consume(TokenType.IDENT, "Expected parameter name")
-            params.append(Param(type=ttype_tok.lexeme, name=name_tok.lexeme))
-            if not self._match(TokenType.COMMA):
+            self.current += 1
+            name_tok = self._consume(_IDENT, "Expected parameter name")
+            params.append(Param(type=type_tok.lexeme, name=name_tok.lexeme))
+            if types[self.current] is not _COMMA:
                 break
+            self.current += 1
         return params
 
     # -------------- statements --------------
     def statement(self) -> Stmt:
-        if self._match(TokenType.KW_FOR):   return self.for_stmt()
-        if self._match(TokenType.KW_WHILE): return self.while_stmt()
-        if self._match(TokenType.KW_IF):    return self.if_stmt()
-        if self._match(TokenType.KW_PRINT): return self.print_stmt()
-        if self._match(TokenType.KW_RETURN):return self.return_stmt()
-        if self._check(TokenType.LBRACE):   return self.block()
+        # one read of the current type, then a single match on it
+        match self.types[self.current]:
+            case TokenType.KW_FOR:
+                self.current += 1; return self.for_stmt()
+            case TokenType.KW_WHILE:
+                self.current += 1; return self.while_stmt()
+            case TokenType.KW_IF:
+                self.current += 1; return self.if_stmt()
+            case TokenType.KW_PRINT:
+                self.current += 1; return self.print_stmt()
+            case TokenType.KW_RETURN:
+                self.current += 1; return self.return_stmt()
+            case TokenType.LBRACE:
+                return self.block()
         return self.expr_stmt()
 
     def block(self) -> Block:
         # Robust: consume '{' if it's still there (function path),
         # or assume it was consumed by statement() (block statement path).
-        if self._check(TokenType.LBRACE):
-            self._advance()
+        types = self.types
+        if types[self.current] is _LBRACE:
+            self.current += 1
         statements: List[Stmt] = []
-        while not self._check(TokenType.RBRACE) and not self._at_end():
-            statements.append(self.declaration())
-        self._consume(TokenType.RBRACE, "Expected '}' after block")
+        append = statements.append
+        while True:
+            t = types[self.current]
+            if t is _RBRACE or t is _EOF:
+                break
+            append(self.declaration())
+        self._consume(_RBRACE, "Expected '}' after block")
         return Block(statements)
 
     def for_stmt(self) -> For:
-        self._consume(TokenType.LPAREN, "Expected '(' after 'for'")
+        self._consume(_LPAREN, "Expected '(' after 'for'")
         # init
-        if self._match(TokenType.SEMI):
+        if self._match1(_SEMI):
             init = None
-        elif self._match(TokenType.KW_INT, TokenType.KW_FLOAT, TokenType.KW_BOOL):
+        elif self._match(_KW_INT, _KW_FLOAT, _KW_BOOL):
             init = self.vardecl_after_type(self._previous())
         else:
             init = self.expr_stmt()
         # cond
         cond: Optional[Expr] = None
-        if not self._check(TokenType.SEMI):
+        if not self._check1(_SEMI):
             cond = self.expression()
-        self._consume(TokenType.SEMI, "Expected ';' after loop condition")
+        self._consume(_SEMI, "Expected ';' after loop condition")
         # post
         post: Optional[Stmt] = None
-        if not self._check(TokenType.RPAREN):
+        if not self._check1(_RPAREN):
             post = self.expr_stmt_no_semi()
-        self._consume(TokenType.RPAREN, "Expected ')' after for clauses")
+        self._consume(_RPAREN, "Expected ')' after for clauses")
         body = self.statement()
         return For(init=init, cond=cond, post=post, body=body)
 
     def vardecl_after_type(self, type_tok: Token) -> VarDecl:
-        name = self._consume(TokenType.IDENT, "Expected variable name")
+        name = self._consume(_IDENT, "Expected variable name")
         init: Optional[Expr] = None
-        if self._match(TokenType.ASSIGN):
+        if self._match1(_ASSIGN):
             init = self.expression()
-        self._consume(TokenType.SEMI, "Expected ';' after declaration")
+        self._consume(_SEMI, "Expected ';' after declaration")
         return VarDecl(var_type=type_tok.lexeme, name=name.lexeme, init=init, line=type_tok.line, col=type_tok.col)
 
     def while_stmt(self) -> While:
-        self._consume(TokenType.LPAREN, "Expected '(' after 'while'")
+        self._consume(_LPAREN, "Expected '(' after 'while'")
         cond = self.expression()
-        self._consume(TokenType.RPAREN, "Expected ')' after condition")
+        self._consume(_RPAREN, "Expected ')' after condition")
         body = self.statement()
         return While(cond=cond, body=body)
 
     def if_stmt(self) -> If:
-        self._consume(TokenType.LPAREN, "Expected '(' after 'if'")
+        self._consume(_LPAREN, "Expected '(' after 'if'")
         cond = self.expression()
-        self._consume(TokenType.RPAREN, "Expected ')' after condition")
+        self._consume(_RPAREN, "Expected ')' after condition")
         then_branch = self.statement()
         else_branch = None
-        if self._match(TokenType.KW_ELSE):
+        if self._match1(_KW_ELSE):
             else_branch = self.statement()
         return If(cond=cond, then_branch=then_branch, else_branch=else_branch)
 
     def print_stmt(self) -> Print:
-        self._consume(TokenType.LPAREN, "Expected '(' after 'print'")
+        self._consume(_LPAREN, "Expected '(' after 'print'")
         e = self.expression()
-        self._consume(TokenType.RPAREN, "Expected ')' after expression")
-        self._consume(TokenType.SEMI, "Expected ';' after print(...) expression")
+        self._consume(_RPAREN, "Expected ')' after expression")
+        self._consume(_SEMI, "Expected ';' after print(...) expression")
         return Print(expr=e)
 
     def return_stmt(self) -> Return:
-        e = None if self._check(TokenType.SEMI) else self.expression()
-        self._consume(TokenType.SEMI, "Expected ';' after return")
+        e = None if self._check1(_SEMI) else self.expression()
+        self._consume(_SEMI, "Expected ';' after return")
         return Return(expr=e)
 
     def expr_stmt(self) -> ExprStmt:
         expr = self.expression()
-        self._consume(TokenType.SEMI, "Expected ';' after expression")
+        self._consume(_SEMI, "Expected ';' after expression")
         return ExprStmt(expr)
 
     def expr_stmt_no_semi(self) -> ExprStmt:
@@ -202,8 +279,8 @@ class Parser:
         return self.assignment()
 
     def assignment(self) -> Expr:
-        expr = self.logic_or()
-        if self._match(TokenType.ASSIGN):
+        expr = self._parse_binary(0)
+        if self._match1(_ASSIGN):
             equals = self._previous()
             value = self.assignment()
             if isinstance(expr, Var):
@@ -211,75 +288,46 @@ class Parser:
             self._error(equals, "Invalid assignment target")
         return expr
 
-    def logic_or(self) -> Expr:
-        expr = self.logic_and()
-        while self._match(TokenType.OR):
-            expr = Binary(expr, '||', self.logic_and())
-        return expr
-
-    def logic_and(self) -> Expr:
-        expr = self.equality()
-        while self._match(TokenType.AND):
-            expr = Binary(expr, '&&', self.equality())
-        return expr
-
-    def equality(self) -> Expr:
-        expr = self.comparison()
-        while self._match(TokenType.EQ, TokenType.NE):
-            op = self._previous().lexeme
-            expr = Binary(expr, op, self.comparison())
-        return expr
-
-    def comparison(self) -> Expr:
-        expr = self.term()
-        while self._match(TokenType.LT, TokenType.LE, TokenType.GT, TokenType.GE):
-            op = self._previous().lexeme
-            expr = Binary(expr, op, self.term())
-        return expr
-
-    def term(self) -> Expr:
-        expr = self.factor()
-        while self._match(TokenType.PLUS, TokenType.MINUS):
-            op = self._previous().lexeme
-            expr = Binary(expr, op, self.factor())
-        return expr
-
-    def factor(self) -> Expr:
-        expr = self.unary()
-        while self._match(TokenType.STAR, TokenType.SLASH, TokenType.PERCENT):
-            op = self._previous().lexeme
-            expr = Binary(expr, op, self.unary())
-        return expr
+    def _parse_binary(self, min_bp: int) -> Expr:
+        # Pratt loop over _BP: replaces the logic_or -> ... -> factor ladder
+        lhs = self.unary()
+        types = self.types
+        while True:
+            bp = _BP.get(types[self.current])
+            if bp is None or bp[0] < min_bp:
+                return lhs
+            self.current += 1
+            lhs = Binary(lhs, bp[2], self._parse_binary(bp[1]))
 
     def unary(self) -> Expr:
-        if self._match(TokenType.BANG, TokenType.MINUS, TokenType.PLUS):
+        if self._match(_BANG, _MINUS, _PLUS):
             op = self._previous().lexeme
             return Unary(op, self.unary())
         return self.primary()
 
     def primary(self) -> Expr:
-        if self._match(TokenType.INT_LIT):
+        if self._match1(_INT_LIT):
             return Literal(int(self._previous().lexeme), 'int')
-        if self._match(TokenType.FLOAT_LIT):
+        if self._match1(_FLOAT_LIT):
             return Literal(float(self._previous().lexeme), 'float')
-        if self._match(TokenType.BOOL_LIT):
+        if self._match1(_BOOL_LIT):
             lex = self._previous().lexeme
             return Literal(True if lex == 'true' else False, 'bool')
-        if self._match(TokenType.IDENT):
+        if self._match1(_IDENT):
             t = self._previous()
-            if self._match(TokenType.LPAREN):
+            if self._match1(_LPAREN):
                 args: List[Expr] = []
-                if not self._check(TokenType.RPAREN):
+                if not self._check1(_RPAREN):
                     while True:
                         args.append(self.expression())
-                        if not self._match(TokenType.COMMA):
+                        if not self._match1(_COMMA):
                             break
-                self._consume(TokenType.RPAREN, "Expected ')' after arguments")
+                self._consume(_RPAREN, "Expected ')' after arguments")
                 return Call(t.lexeme, args, t.line, t.col)
             return Var(t.lexeme, t.line, t.col)
-        if self._match(TokenType.LPAREN):
+        if self._match1(_LPAREN):
             e = self.expression()
-            self._consume(TokenType.RPAREN, "Expected ')' after expression")
+            self._consume(_RPAREN, "Expected ')' after expression")
             return Grouping(e)
         tok = self._peek()
         self._error(tok, f"Unexpected token: {tok.type.name}")
@@ -294,7 +342,8 @@ def parse(tokens: List[Token]):
             ttype = d.get('type')
             if isinstance(ttype, str):
                 ttype = getattr(TT, ttype)
-            converted.append(T(ttype, d.get('lexeme',''), d.get('line',0), d.get('col',0)))
+            # intern like the lexer does: semantics compares type names by identity
+            converted.append(T(ttype, sys.intern(d.get('lexeme','')), d.get('line',0), d.get('col',0)))
         tokens = converted
     parser = Parser(tokens)  # type: ignore
     ast_root, errors = parser.parse()
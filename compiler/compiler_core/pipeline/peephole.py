@@ -1,40 +1,70 @@
 from __future__ import annotations
 from typing import List, Dict
 
-from .codegen import BCInstr, BLabel, BJmp, BIfFalse, BMov, BUnary, BBin, BPrint, BRet, BFunc, BEndFunc, BCall
+from .codegen import BCInstr, BLabel, BJmp, BIfFalse, BIfTrue, BMov, BUnary, BBin, BPrint, BRet, BFunc, BEndFunc, BCall
 
-def remove_mov_self(code: List[BCInstr]) -> List[BCInstr]:
-    return [ins for ins in code if not (isinstance(ins, BMov) and ins.dst == ins.src)]
+def remove_unreachable_after_jmp(code: List[BCInstr]) -> List[BCInstr]:
+    # Nothing falls through a JMP or RET, so what follows it is dead until the
+    # next place control can enter: a label, or a function boundary (calls
+    # land after FUNC, global execution resumes after ENDFUNC).
+    out: List[BCInstr] = []; dead = False
+    for ins in code:
+        if dead:
+            if not isinstance(ins, (BLabel, BFunc, BEndFunc)): continue
+            dead = False
+        out.append(ins)
+        if isinstance(ins, (BJmp, BRet)): dead = True
+    return out
 
-def remove_jmp_to_next_label(code: List[BCInstr]) -> List[BCInstr]:
+def invert_if_over_jmp(code: List[BCInstr]) -> List[BCInstr]:
+    # IFFALSE c, L; JMP L2; L:  ->  IFTRUE c, L2
+    # Only when the IFFALSE is the sole jump to L, so L goes away with it;
+    # otherwise the label stays and nothing is gained.
+    refs: Dict[str, int] = {}
+    for ins in code:
+        if isinstance(ins, (BJmp, BIfFalse, BIfTrue)): refs[ins.label] = refs.get(ins.label, 0) + 1
     out: List[BCInstr] = []; n = len(code); i = 0
     while i < n:
         ins = code[i]
-        if isinstance(ins, BJmp) and i + 1 < n and isinstance(code[i+1], BLabel) and code[i+1].name == ins.label:
-            i += 1; continue
+        if isinstance(ins, BIfFalse) and i + 2 < n and refs[ins.label] == 1:
+            jmp, lbl = code[i+1], code[i+2]
+            if isinstance(jmp, BJmp) and isinstance(lbl, BLabel) and lbl.name == ins.label:
+                out.append(BIfTrue(ins.cond, jmp.label)); i += 3; continue
         out.append(ins); i += 1
     return out
 
-def collapse_consecutive_labels(code: List[BCInstr]) -> List[BCInstr]:
+def _peephole_once(code: List[BCInstr]) -> List[BCInstr]:
+    # One walk applying all three rewrites: drop MOV x, x; drop a JMP to the
+    # label right after it; keep only the first label of a run and send jumps
+    # for the others to it.
     out: List[BCInstr] = []; label_map: Dict[str,str] = {}; prev_label = None
-    for ins in code:
-        if isinstance(ins, BLabel):
-            if prev_label is None: out.append(ins); prev_label = ins.name
-            else: label_map[ins.name] = prev_label
-        else:
-            prev_label = None; out.append(ins)
-    def remap(name: str) -> str:
-        while name in label_map: name = label_map[name]
-        return name
-    remapped: List[BCInstr] = []
-    for ins in out:
-        if isinstance(ins, BJmp): remapped.append(BJmp(remap(ins.label)))
-        elif isinstance(ins, BIfFalse): remapped.append(BIfFalse(ins.cond, remap(ins.label)))
-        else: remapped.append(ins)
-    return remapped
+    n = len(code)
+    for i, ins in enumerate(code):
+        if isinstance(ins, BMov):
+            if ins.dst == ins.src: continue
+        elif isinstance(ins, BJmp):
+            nxt = code[i+1] if i + 1 < n else None
+            if isinstance(nxt, BLabel) and nxt.name == ins.label: continue
+        elif isinstance(ins, BLabel):
+            if prev_label is not None: label_map[ins.name] = prev_label; continue
+            prev_label = ins.name; out.append(ins); continue
+        prev_label = None; out.append(ins)
+    if not label_map:
+        return out
+    # Every label is mapped straight to the first label of its run, which is
+    # itself never mapped, so one lookup resolves it: no chains to walk.
+    for i, ins in enumerate(out):
+        if isinstance(ins, BJmp) and ins.label in label_map: out[i] = BJmp(label_map[ins.label])
+        elif isinstance(ins, BIfFalse) and ins.label in label_map: out[i] = BIfFalse(ins.cond, label_map[ins.label])
+        elif isinstance(ins, BIfTrue) and ins.label in label_map: out[i] = BIfTrue(ins.cond, label_map[ins.label])
+    return out
 
 def peephole(code: List[BCInstr]) -> List[BCInstr]:
-    code = remove_mov_self(code)
-    code = remove_jmp_to_next_label(code)
-    code = collapse_consecutive_labels(code)
-    return code
\ No newline at end of file
+    # Rerun until nothing changes, since one rewrite can expose another (a
+    # collapsed label turns a jump into a jump to the next label). Every
+    # rewrite drops an instruction, so an unchanged length is a fixed point.
+    while True:
+        new = _peephole_once(invert_if_over_jmp(remove_unreachable_after_jmp(code)))
+        if len(new) == len(code):
+            return new
+        code = new
\ No newline at end of file
@@ -1,6 +1,7 @@
 from __future__ import annotations
+import sys
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Tuple
+from typing import Any, Callable, List, Optional, Dict, Tuple
 
 from compiler_core.domain.ast_nodes import (
     Program, Block, VarDecl, If, While, For, Print, Return, ExprStmt,
@@ -8,286 +9,324 @@ from compiler_core.domain.ast_nodes import (
     FunctionDecl, Param, Call, typed_ast_to_dict
 )
 from compiler_core.domain.symbol_table import SymbolTable, Symbol
-from compiler_core.domain.errors import ParseError
 
-NUMERIC = {'int', 'float'}
-BOOL = 'bool'
-INT = 'int'
-FLOAT = 'float'
-VOID = 'void'
-ERROR = 'error'
+# Type names are interned, and so are the lexemes the parser builds type
+# names from, so type checks below compare by identity (`is`).
+BOOL = sys.intern('bool')
+INT = sys.intern('int')
+FLOAT = sys.intern('float')
+VOID = sys.intern('void')
+ERROR = sys.intern('error')
 
-@dataclass
+# Binary type rules as a table built once at import:
+# (op, left type, right type) -> result type. Missing combinations are type
+# errors, reported with the operator's message from _BINARY_ERRORS.
+_BINARY_RESULT: Dict[Tuple[str, str, str], str] = {}
+for _op in ('+', '-', '*', '/'):
+    for _lt in (INT, FLOAT):
+        for _rt in (INT, FLOAT):
+            _BINARY_RESULT[_op, _lt, _rt] = FLOAT if _lt is FLOAT or _rt is FLOAT else INT
+_BINARY_RESULT['%', INT, INT] = INT
+for _op in ('<', '<=', '>', '>='):
+    for _lt in (INT, FLOAT):
+        for _rt in (INT, FLOAT):
+            _BINARY_RESULT[_op, _lt, _rt] = BOOL
+for _op in ('==', '!='):
+    for _t in (INT, FLOAT, BOOL, VOID):
+        _BINARY_RESULT[_op, _t, _t] = BOOL
+for _op in ('&&', '||'):
+    _BINARY_RESULT[_op, BOOL, BOOL] = BOOL
+
+_BINARY_ERRORS: Dict[str, str] = {
+    **{op: f"Operator '{op}' requires numeric operands" for op in ('+', '-', '*', '/', '<', '<=', '>', '>=')},
+    '%': "'%' requires int operands",
+    '==': "'=='/'!=' require operands of the same type",
+    '!=': "'=='/'!=' require operands of the same type",
+    '&&': "'&&'/'||' require bool operands",
+    '||': "'&&'/'||' require bool operands",
+}
+del _op, _lt, _rt, _t
+
+@dataclass(slots=True)
 class FuncSig:
     ret: str
     params: List[Tuple[str, str]]  # (type, name)
 
+JSON = Dict[str, Any]
+
 class SemanticAnalyzer:
+    """Type-checks the AST and, in the same walk, builds its typed JSON.
+
+    Statement visitors return the statement's typed dict; expression
+    visitors return ``(inferred type, typed dict)``. The dicts have the same
+    shape as ``typed_ast_to_dict`` output. Subtrees the checker never visits
+    (nested functions, surplus call arguments) fall back to it.
+    """
     def __init__(self):
         self.symtab = SymbolTable()
-        self.errors: List[ParseError] = []
+        self.errors: List[Tuple[str, int, int]] = []  # (message, line, col)
         self.funcs: Dict[str, FuncSig] = {}
         self.current_ret: Optional[str] = None
+        # exact node type -> visitor, built once; replaces the isinstance chains
+        self._stmt_dispatch: Dict[type, Callable[[Stmt], JSON]] = {
+            Block: self.visit_block, VarDecl: self.visit_vardecl, If: self.visit_if,
+            While: self.visit_while, For: self.visit_for, Print: self.visit_print,
+            Return: self.visit_return, ExprStmt: self.visit_exprstmt,
+        }
+        self._expr_dispatch: Dict[type, Callable[[Expr], Tuple[str, JSON]]] = {
+            Assign: self.visit_assign, Call: self.visit_call,
+            Var: self.visit_var, Unary: self.visit_unary, Binary: self.visit_binary,
+            Grouping: self.visit_grouping,
+        }
 
     def err(self, line: int, col: int, msg: str):
-        self.errors.append(ParseError(msg, line, col))
+        self.errors.append((msg, line, col))
 
     # entry
-    def visit_program(self, node: Program):
+    def visit_program(self, node: Program) -> JSON:
+        funcs = self.funcs
         # collect function signatures
         for s in node.body:
-            if isinstance(s, FunctionDecl):
-                if s.name in self.funcs:
+            if type(s) is FunctionDecl:
+                if s.name in funcs:
                     self.err(0, 0, f"Redeclaration of function '{s.name}'")
                 else:
-                    self.funcs[s.name] = FuncSig(s.return_type, [(p.type, p.name) for p in s.params])
-        # analyze
+                    funcs[s.name] = FuncSig(s.return_type, [(p.type, p.name) for p in s.params])
+        # analyze (bound methods hoisted out of the per-statement loop)
+        visit_stmt = self.visit_stmt
+        visit_function = self.visit_function
+        body: List[JSON] = []
+        append = body.append
         for s in node.body:
-            if isinstance(s, FunctionDecl):
-                self.visit_function(s)
+            if type(s) is FunctionDecl:
+                append(visit_function(s))
             else:
-                self.visit_stmt(s)
-        return node
+                append(visit_stmt(s))
+        return {"type": "Program", "body": body}
 
     # statements
-    def visit_block(self, node: Block):
-        self.symtab.push_scope()
+    def visit_block(self, node: Block) -> JSON:
+        symtab = self.symtab
+        symtab.push_scope()
+        visit_stmt = self.visit_stmt
+        statements: List[JSON] = []
+        append = statements.append
         for s in node.statements:
-            if isinstance(s, FunctionDecl):
+            if type(s) is FunctionDecl:
                 self.err(0, 0, "Nested function declarations not allowed")
+                append(typed_ast_to_dict(s))
             else:
-                self.visit_stmt(s)
-        self.symtab.pop_scope()
-        return node
+                append(visit_stmt(s))
+        symtab.pop_scope()
+        return {"type": "Block", "statements": statements}
 
-    def visit_function(self, node: FunctionDecl):
+    def visit_function(self, node: FunctionDecl) -> JSON:
         saved_ret = self.current_ret
         self.current_ret = node.return_type
         self.symtab.push_scope()
         for p in node.params:
             if not self.symtab.define(p.name, p.type):
                 self.err(0, 0, f"Parameter redeclared: {p.name}")
-        self.visit_block(node.body)
+        body = self.visit_block(node.body)
         self.symtab.pop_scope()
         self.current_ret = saved_ret
-        return node
+        return {
+            "type": "FunctionDecl",
+            "return_type": node.return_type,
+            "name": node.name,
+            "params": [{"type": p.type, "name": p.name} for p in node.params],
+            "body": body,
+        }
 
-    def visit_vardecl(self, node: VarDecl):
+    def visit_vardecl(self, node: VarDecl) -> JSON:
         if not self.symtab.define(node.name, node.var_type):
             self.err(node.line, node.col, f"Redeclaration of '{node.name}'")
+        init = None
         if node.init is not None:
-            t = self.visit_expr(node.init)
+            t, init = self.visit_expr(node.init)
             if not self.assignable(node.var_type, t):
                 self.err(node.line, node.col, f"Cannot assign {t} to {node.var_type} in declaration '{node.name}'")
-        return node
+        return {"type": "VarDecl", "var_type": node.var_type, "name": node.name, "init": init, "line": node.line, "col": node.col}
 
-    def visit_if(self, node: If):
-        t = self.visit_expr(node.cond)
-        if t != BOOL:
+    def visit_if(self, node: If) -> JSON:
+        t, cond = self.visit_expr(node.cond)
+        if t is not BOOL:
             self.err(0, 0, "if condition must be bool")
-        self.visit_stmt(node.then_branch)
-        if node.else_branch:
-            self.visit_stmt(node.else_branch)
-        return node
+        then = self.visit_stmt(node.then_branch)
+        else_ = self.visit_stmt(node.else_branch) if node.else_branch else None
+        return {"type": "If", "cond": cond, "then": then, "else": else_}
 
-    def visit_while(self, node: While):
-        t = self.visit_expr(node.cond)
-        if t != BOOL:
+    def visit_while(self, node: While) -> JSON:
+        t, cond = self.visit_expr(node.cond)
+        if t is not BOOL:
             self.err(0, 0, "while condition must be bool")
-        self.visit_stmt(node.body)
-        return node
+        body = self.visit_stmt(node.body)
+        return {"type": "While", "cond": cond, "body": body}
 
-    def visit_for(self, node: For):
+    def visit_for(self, node: For) -> JSON:
         self.symtab.push_scope()
+        init = cond = post = None
         if node.init:
-            self.visit_stmt(node.init)
+            init = self.visit_stmt(node.init)
         if node.cond:
-            t = self.visit_expr(node.cond)
-            if t != BOOL:
+            t, cond = self.visit_expr(node.cond)
+            if t is not BOOL:
                 self.err(0, 0, "for condition must be bool")
         if node.post:
-            self.visit_stmt(node.post)
-        self.visit_stmt(node.body)
+            post = self.visit_stmt(node.post)
+        body = self.visit_stmt(node.body)
         self.symtab.pop_scope()
-        return node
+        return {"type": "For", "init": init, "cond": cond, "post": post, "body": body}
 
-    def visit_print(self, node: Print):
-        self.visit_expr(node.expr)
-        return node
+    def visit_print(self, node: Print) -> JSON:
+        return {"type": "Print", "expr": self.visit_expr(node.expr)[1]}
 
-    def visit_return(self, node: Return):
+    def visit_return(self, node: Return) -> JSON:
+        expr = None
         # Allow top-level return to end the program (no error).
         if self.current_ret is None:
             if node.expr is not None:
-                self.visit_expr(node.expr)  # just type-check expression
-            return node
+                expr = self.visit_expr(node.expr)[1]  # just type-check expression
         # In-function checks
-        if node.expr is None:
-            if self.current_ret != VOID:
+        elif node.expr is None:
+            if self.current_ret is not VOID:
                 self.err(0, 0, f"Return value required for function returning {self.current_ret}")
         else:
-            t = self.visit_expr(node.expr)
+            t, expr = self.visit_expr(node.expr)
             if not self.assignable(self.current_ret, t):
                 self.err(0, 0, f"Cannot return {t} from function returning {self.current_ret}")
-        return node
+        return {"type": "Return", "expr": expr}
 
-    def visit_exprstmt(self, node: ExprStmt):
-        self.visit_expr(node.expr)
-        return node
+    def visit_exprstmt(self, node: ExprStmt) -> JSON:
+        return {"type": "ExprStmt", "expr": self.visit_expr(node.expr)[1]}
 
-    def visit_stmt(self, node: Stmt):
-        if isinstance(node, Block):      return self.visit_block(node)
-        if isinstance(node, VarDecl):    return self.visit_vardecl(node)
-        if isinstance(node, If):         return self.visit_if(node)
-        if isinstance(node, While):      return self.visit_while(node)
-        if isinstance(node, For):        return self.visit_for(node)
-        if isinstance(node, Print):      return self.visit_print(node)
-        if isinstance(node, Return):     return self.visit_return(node)
-        if isinstance(node, ExprStmt):   return self.visit_exprstmt(node)
-        return node
+    def visit_stmt(self, node: Stmt) -> JSON:
+        fn = self._stmt_dispatch.get(type(node))
+        return fn(node) if fn is not None else typed_ast_to_dict(node)
 
     # expressions
-    def visit_assign(self, node: Assign) -> str:
+    def visit_assign(self, node: Assign) -> Tuple[str, JSON]:
         sym = self.symtab.resolve(node.name)
         if sym is None:
             self.err(node.line, node.col, f"Undeclared variable '{node.name}'")
-            node.inferred_type = ERROR
-            self.visit_expr(node.value)
-            return ERROR
-        val_t = self.visit_expr(node.value)
-        if not self.assignable(sym.type, val_t):
-            self.err(node.line, node.col, f"Cannot assign {val_t} to {sym.type} variable '{node.name}'")
-            node.inferred_type = ERROR
-            return ERROR
-        node.inferred_type = sym.type
-        return sym.type
+            t = ERROR
+            value = self.visit_expr(node.value)[1]
+        else:
+            val_t, value = self.visit_expr(node.value)
+            if self.assignable(sym.type, val_t):
+                t = sym.type
+            else:
+                self.err(node.line, node.col, f"Cannot assign {val_t} to {sym.type} variable '{node.name}'")
+                t = ERROR
+        node.inferred_type = t
+        return t, {"type": "Assign", "name": node.name, "value": value, "line": node.line, "col": node.col, "inferred": t}
 
-    def visit_call(self, node: Call) -> str:
+    def visit_call(self, node: Call) -> Tuple[str, JSON]:
         sig = self.funcs.get(node.name)
         if sig is None:
             self.err(node.line, node.col, f"Call to undefined function '{node.name}'")
-            node.inferred_type = ERROR
-            for a in node.args:
-                self.visit_expr(a)
-            return ERROR
-        if len(node.args) != len(sig.params):
-            self.err(node.line, node.col, f"Function '{node.name}' expects {len(sig.params)} arg(s), got {len(node.args)}")
-        for (pt, _), arg in zip(sig.params, node.args):
-            at = self.visit_expr(arg)
-            if not self.assignable(pt, at):
-                self.err(node.line, node.col, f"Argument type {at} incompatible with parameter {pt} in call to '{node.name}'")
-        node.inferred_type = sig.ret
-        return sig.ret
-
-    def visit_literal(self, node: Literal) -> str:
-        node.inferred_type = node.kind
-        return node.kind
+            t = ERROR
+            args = [self.visit_expr(a)[1] for a in node.args]
+        else:
+            params = sig.params
+            nparams = len(params)
+            node_args = node.args
+            nargs = len(node_args)
+            if nargs != nparams:
+                self.err(node.line, node.col, f"Function '{node.name}' expects {nparams} arg(s), got {nargs}")
+            visit_expr = self.visit_expr
+            assignable = self.assignable
+            checked = min(nparams, nargs)
+            args = []
+            for i in range(checked):
+                pt = params[i][0]
+                at, arg_json = visit_expr(node_args[i])
+                args.append(arg_json)
+                if not assignable(pt, at):
+                    self.err(node.line, node.col, f"Argument type {at} incompatible with parameter {pt} in call to '{node.name}'")
+            # surplus arguments are not checked, only serialized
+            for i in range(checked, nargs):
+                args.append(typed_ast_to_dict(node_args[i]))
+            t = sig.ret
+        node.inferred_type = t
+        return t, {"type": "Call", "name": node.name, "args": args, "line": node.line, "col": node.col, "inferred": t}
 
-    def visit_var(self, node: Var) -> str:
+    def visit_var(self, node: Var) -> Tuple[str, JSON]:
         sym = self.symtab.resolve(node.name)
         if sym is None:
             self.err(node.line, node.col, f"Undeclared variable '{node.name}'")
-            node.inferred_type = ERROR
-            return ERROR
-        node.inferred_type = sym.type
-        return sym.type
+            t = ERROR
+        else:
+            t = sym.type
+        node.inferred_type = t
+        return t, {"type": "Var", "name": node.name, "line": node.line, "col": node.col, "inferred": t}
 
-    def visit_unary(self, node: Unary) -> str:
-        t = self.visit_expr(node.right)
-        if node.op == '!':
-            if t != BOOL:
+    def visit_unary(self, node: Unary) -> Tuple[str, JSON]:
+        rt, right = self.visit_expr(node.right)
+        t = node.inferred_type = self.unary_type(node.op, rt)
+        return t, {"type": "Unary", "op": node.op, "right": right, "inferred": t}
+
+    def visit_binary(self, node: Binary) -> Tuple[str, JSON]:
+        lt, left = self.visit_expr(node.left)
+        rt, right = self.visit_expr(node.right)
+        t = node.inferred_type = self.binary_type(node.op, lt, rt)
+        return t, {"type": "Binary", "op": node.op, "left": left, "right": right, "inferred": t}
+
+    def visit_grouping(self, node: Grouping) -> Tuple[str, JSON]:
+        t, expr = self.visit_expr(node.expr)
+        node.inferred_type = t
+        return t, {"type": "Grouping", "expr": expr, "inferred": t}
+
+    def visit_expr(self, node: Expr) -> Tuple[str, JSON]:
+        if type(node) is Literal:
+            # inferred_type was set to kind at construction; nothing to check
+            t = node.kind
+            return t, {"type": "Literal", "value": node.value, "kind": t, "inferred": t}
+        fn = self._expr_dispatch.get(type(node))
+        if fn is not None:
+            return fn(node)
+        node.inferred_type = ERROR
+        return ERROR, typed_ast_to_dict(node)
+
+    # type rules
+    def unary_type(self, op: str, t: str) -> str:
+        if op == '!':
+            if t is not BOOL:
                 self.err(0, 0, "'!' requires bool")
-                node.inferred_type = ERROR
                 return ERROR
-            node.inferred_type = BOOL
             return BOOL
-        if node.op in ('+', '-'):
-            if t not in NUMERIC:
-                self.err(0, 0, f"Unary '{node.op}' requires numeric operand")
-                node.inferred_type = ERROR
+        if op in ('+', '-'):
+            if t is not INT and t is not FLOAT:
+                self.err(0, 0, f"Unary '{op}' requires numeric operand")
                 return ERROR
-            node.inferred_type = t
             return t
-        node.inferred_type = ERROR
         return ERROR
 
-    def visit_binary(self, node: Binary) -> str:
-        lt = self.visit_expr(node.left)
-        rt = self.visit_expr(node.right)
-        op = node.op
-        if op in ('+','-','*','/'):
-            if lt in NUMERIC and rt in NUMERIC:
-                node.inferred_type = FLOAT if FLOAT in (lt, rt) else INT
-                return node.inferred_type
-            self.err(0,0, f"Operator '{op}' requires numeric operands")
-            node.inferred_type = ERROR
-            return ERROR
-        if op == '%':
-            if lt == INT and rt == INT:
-                node.inferred_type = INT
-                return INT
-            self.err(0,0, "'%' requires int operands")
-            node.inferred_type = ERROR
-            return ERROR
-        if op in ('<','<=','>','>='):
-            if lt in NUMERIC and rt in NUMERIC:
-                node.inferred_type = BOOL
-                return BOOL
-            self.err(0,0, f"Operator '{op}' requires numeric operands")
-            node.inferred_type = ERROR
+    def binary_type(self, op: str, lt: str, rt: str) -> str:
+        t = _BINARY_RESULT.get((op, lt, rt))
+        if t is None:
+            self.err(0, 0, _BINARY_ERRORS.get(op) or f"Unknown operator '{op}'")
             return ERROR
-        if op in ('==','!='):
-            if lt == rt and lt != ERROR:
-                node.inferred_type = BOOL
-                return BOOL
-            self.err(0,0, "'=='/'!=' require operands of the same type")
-            node.inferred_type = ERROR
-            return ERROR
-        if op in ('&&','||'):
-            if lt == BOOL and rt == BOOL:
-                node.inferred_type = BOOL
-                return BOOL
-            self.err(0,0, "'&&'/'||' require bool operands")
-            node.inferred_type = ERROR
-            return ERROR
-        self.err(0,0, f"Unknown operator '{op}'")
-        node.inferred_type = ERROR
-        return ERROR
-
-    def visit_grouping(self, node: Grouping) -> str:
-        t = self.visit_expr(node.expr)
-        node.inferred_type = t
         return t
 
-    def visit_expr(self, node: Expr) -> str:
-        if isinstance(node, Assign):   return self.visit_assign(node)
-        if isinstance(node, Call):     return self.visit_call(node)
-        if isinstance(node, Literal):  return self.visit_literal(node)
-        if isinstance(node, Var):      return self.visit_var(node)
-        if isinstance(node, Unary):    return self.visit_unary(node)
-        if isinstance(node, Binary):   return self.visit_binary(node)
-        if isinstance(node, Grouping): return self.visit_grouping(node)
-        node.inferred_type = ERROR
-        return ERROR
-
     # helpers
     def assignable(self, to_type: str, from_type: str) -> bool:
-        if to_type == from_type:
+        if to_type is from_type:
             return True
-        if to_type == FLOAT and from_type == INT:
+        if to_type is FLOAT and from_type is INT:
             return True
-        if to_type == VOID:
-            return from_type == VOID
+        if to_type is VOID:
+            return from_type is VOID
         return False
 
 def analyze(ast_root: Program):
     analyzer = SemanticAnalyzer()
-    typed_root = analyzer.visit_program(ast_root)
-    typed_json = typed_ast_to_dict(typed_root)
+    # one walk: type-check and build the typed JSON together
+    typed_json = analyzer.visit_program(ast_root)
     sym_json = analyzer.symtab.to_json()
-    errors = [e.__dict__ for e in analyzer.errors]
+    errors = [{"message": m, "line": l, "col": c} for m, l, c in analyzer.errors]
     return {
-        'typed_root': typed_root,
+        'typed_root': ast_root,
         'typed_json': typed_json,
         'symbol_table': sym_json,
         'errors': errors,
@@ -1,156 +1,377 @@
 from __future__ import annotations
+import math
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 
-from .codegen import BCInstr, BLabel, BJmp, BIfFalse, BMov, BUnary, BBin, BPrint, BRet, BFunc, BEndFunc, BCall
+from .codegen import (
+    BCInstr,
+    OP_LABEL, OP_JMP, OP_IFFALSE, OP_MOV, OP_UNARY, OP_BIN, OP_PRINT, OP_RET, OP_FUNC, OP_ENDFUNC, OP_CALL,
+    OP_IFTRUE,
+)
 
 def _parse_num(x: str) -> Optional[float]:
     try: return float(x)
     except Exception: return None
 
+# A frame's env is a list indexed by variable slot. Slots are numbered over
+# the whole program, so every frame has the same layout: the global frame
+# starts at 0.0 everywhere, a call frame starts unset (None) except for its
+# params, and reading an unset local falls through to the global value --
+# the same lookup order as the old per-frame name dicts.
+Env = List[Optional[float]]
+
 @dataclass
 class Frame:
-    env: Dict[str, float]
+    env: Env
     ret_pc: int
-    ret_dst: Optional[str]
+    ret_dst: Optional[int]
+
+# ---- hot blocks ----
+# Straight-line runs of bytecode (optionally ending in a jump/branch) are basic
+# blocks. Once a block has been entered _HOT times, run() compiles it to a
+# Python function over the frame's env list, so a whole loop body costs one
+# call instead of one handler dispatch per instruction. Compiling is lazy
+# because exec'ing every block up front costs more than most runs (the step
+# budget is small); calls, returns and function boundaries stay in handlers.
+# A block outside every FUNC..ENDFUNC only ever runs in the global frame, so
+# its reads skip the unset-local fallback (the global env has no None slots).
+_HOT = 64
+_STRAIGHT = frozenset((OP_LABEL, OP_MOV, OP_UNARY, OP_BIN, OP_PRINT))
+_UNARY_EXPR = {'!': '0.0 if a != 0.0 else 1.0', '+': '+a', '-': '-a'}
+_BIN_EXPR = {
+    '+': 'a + b', '-': 'a - b', '*': 'a * b', '/': 'a / b',
+    '%': 'float(int(a) % int(b))',
+    '<': '1.0 if a < b else 0.0', '<=': '1.0 if a <= b else 0.0',
+    '>': '1.0 if a > b else 0.0', '>=': '1.0 if a >= b else 0.0',
+    '==': '1.0 if a == b else 0.0', '!=': '1.0 if a != b else 0.0',
+    '&&': '1.0 if (a != 0 and b != 0) else 0.0',
+    '||': '1.0 if (a != 0 or b != 0) else 0.0',
+}
+
+class _Block:
+    __slots__ = ('start', 'end', 'local', 'heat', 'fn')
+
+    def __init__(self, start: int, end: int, local: bool):
+        self.start = start
+        self.end = end  # exclusive
+        self.local = local  # inside a function body: env may be a call frame
+        self.heat = 0
+        self.fn: Optional[Callable[[Env], int]] = None
 
 class VM:
     def __init__(self, code: List[BCInstr]):
         self.code = code
         self.labels: Dict[str, int] = {}
         self.func_meta: Dict[str, Dict[str, int | List[str]]] = {}
+        self.slots: Dict[str, int] = {}  # variable name -> env slot
         self._index()
         self.pc = 0
         self.n = len(code)
         self.stack: List[Frame] = []
-        self.global_env: Dict[str, float] = {}
-        self.env: Dict[str, float] = self.global_env
+        self.global_env: Env = [0.0] * len(self.slots)
+        self.env: Env = self.global_env
         self.output: List[str] = []
+        self.blocks = self._find_blocks()
+        self.handlers: List[Callable[[tuple], bool]] = [None] * 12  # type: ignore
+        for op, handler in ((OP_LABEL, self._exec_label), (OP_JMP, self._exec_jmp),
+                            (OP_IFFALSE, self._exec_iffalse), (OP_MOV, self._exec_mov),
+                            (OP_UNARY, self._exec_unary), (OP_BIN, self._exec_bin),
+                            (OP_PRINT, self._exec_print), (OP_RET, self._exec_ret),
+                            (OP_FUNC, self._exec_func), (OP_ENDFUNC, self._exec_endfunc),
+                            (OP_CALL, self._exec_call), (OP_IFTRUE, self._exec_iftrue)):
+            self.handlers[op] = handler
 
     def _index(self):
-        # Build label map and function start/end ranges
+        # Build label map and function start/end ranges, and decode every
+        # instruction into self.ops: a tuple (op_id, operands...) in which
+        # numeric operands are already floats, so execution never re-parses
+        # them, variables are env slots (ints) and branch targets are pcs.
+        # Function names stay strings.
         func_stack: List[str] = []
+        ops: List[tuple] = []
+        branches: List[int] = []  # pcs of jumps, patched once labels are known
+        funcs: List[int] = []  # pcs of FUNC, patched once function ends are known
+        in_func = self.in_func = [False] * len(self.code)  # pc inside FUNC..ENDFUNC
+        append = ops.append
+        slots = self.slots
+
+        def slot(name: str) -> int:
+            s = slots.get(name)
+            if s is None:
+                s = slots[name] = len(slots)
+            return s
+
+        def num(x: str) -> float | int:
+            v = _parse_num(x)
+            return slot(x) if v is None else v
+
         for i, ins in enumerate(self.code):
-            if isinstance(ins, BLabel):
+            op = ins.op_id
+            if func_stack:
+                in_func[i] = True
+            if op == OP_BIN:
+                append((op, slot(ins.dst), ins.op, num(ins.left), num(ins.right)))
+            elif op == OP_MOV:
+                append((op, slot(ins.dst), num(ins.src)))
+            elif op == OP_IFFALSE or op == OP_IFTRUE:
+                branches.append(i)
+                append((op, num(ins.cond), ins.label))
+            elif op == OP_JMP:
+                branches.append(i)
+                append((op, ins.label))
+            elif op == OP_LABEL:
                 self.labels[ins.name] = i
-            elif isinstance(ins, BFunc):
-                self.func_meta[ins.name] = {'start': i, 'end': i, 'params': ins.params}
+                append((op,))
+            elif op == OP_UNARY:
+                append((op, slot(ins.dst), ins.op, num(ins.src)))
+            elif op == OP_PRINT:
+                append((op, num(ins.value)))
+            elif op == OP_RET:
+                append((op, None if ins.value is None else num(ins.value)))
+            elif op == OP_CALL:
+                dst = None if ins.dst is None else slot(ins.dst)
+                append((op, dst, ins.name, [num(a) for a in ins.args]))
+            elif op == OP_FUNC:
+                self.func_meta[ins.name] = {'start': i, 'end': i, 'params': ins.params,
+                                            'param_slots': [slot(p) for p in ins.params]}
                 func_stack.append(ins.name)
-            elif isinstance(ins, BEndFunc):
+                funcs.append(i)
+                append((op, ins.name))
+            elif op == OP_ENDFUNC:
                 if func_stack:
                     name = func_stack.pop()
                     self.func_meta[name]['end'] = i  # type: ignore
+                append((op,))
+        # A jump to an unknown label falls through, as it always has.
+        labels = self.labels
+        for i in branches:
+            op = ops[i]
+            ops[i] = op[:-1] + (labels.get(op[-1], i + 1),)
+        # FUNC gets the pc global execution skips to: past the ENDFUNC of
+        # the last definition of that name, like the func_meta lookup did.
+        func_meta = self.func_meta
+        for i in funcs:
+            name = ops[i][1]
+            ops[i] = (OP_FUNC, name, int(func_meta[name]['end']) + 1)  # type: ignore
+        self.ops = ops
+
+    def _find_blocks(self) -> List[Optional[_Block]]:
+        # A block starts at a leader: pc 0, a label, or the instruction after
+        # any control transfer (jump/branch/call/return/function boundary),
+        # which covers every pc execution can arrive at other than by falling
+        # through.
+        ops = self.ops
+        n = len(ops)
+        leader = [False] * (n + 1)
+        leader[0] = True
+        for i, op in enumerate(ops):
+            if op[0] == OP_LABEL:
+                leader[i] = True
+            elif op[0] not in _STRAIGHT:
+                leader[i + 1] = True
+        blocks: List[Optional[_Block]] = [None] * n
+        for i in range(n):
+            if not leader[i]:
+                continue
+            j = i
+            while j < n and (j == i or not leader[j]):
+                op = ops[j]
+                kind = op[0]
+                if kind == OP_JMP or kind == OP_IFFALSE or kind == OP_IFTRUE:
+                    j += 1
+                    break
+                if (kind not in _STRAIGHT or (kind == OP_BIN and op[2] not in _BIN_EXPR)
+                        or (kind == OP_UNARY and op[2] not in _UNARY_EXPR)):
+                    break  # left to the handler (unknown ops raise there)
+                j += 1
+            if j - i >= 2:
+                blocks[i] = _Block(i, j, self.in_func[i])
+        return blocks
+
+    def _compile_block(self, blk: _Block) -> Callable[[Env], int]:
+        # Generates `def block(env): ...; return next_pc` with the decoded
+        # operands baked in. Reads follow _get: the env slot, else the global
+        # (in a global block env is the global env, so just the slot).
+        lines = ['def block(env):']
+        emit = lines.append
+        local = blk.local
+
+        def load(var: str, x: float | int):
+            if type(x) is float:
+                emit(f'    {var} = {x!r}' if math.isfinite(x) else f"    {var} = float('{x!r}')")
+            else:
+                emit(f'    {var} = env[{x}]')
+                if local:
+                    emit(f'    if {var} is None: {var} = g[{x}]')
+
+        ops = self.ops
+        for pc in range(blk.start, blk.end):
+            op = ops[pc]
+            kind = op[0]
+            if kind == OP_MOV:
+                load('a', op[2])
+                emit(f'    env[{op[1]}] = a')
+            elif kind == OP_BIN:
+                load('a', op[3]); load('b', op[4])
+                emit(f'    env[{op[1]}] = {_BIN_EXPR[op[2]]}')
+            elif kind == OP_UNARY:
+                load('a', op[3])
+                emit(f'    env[{op[1]}] = {_UNARY_EXPR[op[2]]}')
+            elif kind == OP_PRINT:
+                load('a', op[1])
+                emit('    out(fmt(a))')
+            elif kind == OP_JMP:
+                emit(f'    return {op[1]}')
+            elif kind == OP_IFFALSE:
+                load('a', op[1])
+                emit(f'    if a == 0.0: return {op[2]}')
+            elif kind == OP_IFTRUE:
+                load('a', op[1])
+                emit(f'    if a != 0.0: return {op[2]}')
+        if ops[blk.end - 1][0] != OP_JMP:
+            emit(f'    return {blk.end}')
+        namespace = {'g': self.global_env, 'out': self.output.append, 'fmt': self._fmt}
+        exec(compile('\n'.join(lines), f'<vm block {blk.start}>', 'exec'), namespace)
+        return namespace['block']
 
     def _is_true(self, v: float) -> bool: return v != 0.0
     def _fmt(self, v: float) -> str: return str(int(v)) if v.is_integer() else str(v)
 
-    def _get(self, x: str) -> float:
-        v = _parse_num(x)
-        if v is not None: return v
-        if x in self.env: return self.env[x]
-        return self.global_env.get(x, 0.0)
+    def _get(self, x: float | int) -> float:
+        if type(x) is float: return x
+        v = self.env[x]
+        return self.global_env[x] if v is None else v
 
-    def _set(self, name: str, val: float): self.env[name] = val
+    def _set(self, slot: int, val: float): self.env[slot] = val
 
-    def step(self) -> bool:
-        if self.pc >= self.n: return False
-        ins = self.code[self.pc]; self.pc += 1
+    # One handler per opcode, indexed by op_id (see codegen.OP_*). Each takes
+    # the decoded instruction from self.ops and returns False to stop
+    # execution, like step().
+    def _exec_label(self, op: tuple) -> bool:
+        return True
 
-        # Skip function bodies during global execution
-        if isinstance(ins, BFunc):
-            if not self.stack:
-                end = int(self.func_meta.get(ins.name, {}).get('end', self.pc - 1))
-                self.pc = end + 1
-                return True
-            return True  # inside a call we never land on BFunc
-
-        if isinstance(ins, BEndFunc):
-            # Implicit return 0 when a function ends without RET
-            if self.stack:
-                frame = self.stack.pop()
-                self.env = frame.env
-                if frame.ret_dst is not None:
-                    self._set(frame.ret_dst, 0.0)
-                self.pc = frame.ret_pc
-            return True
+    def _exec_jmp(self, op: tuple) -> bool:
+        self.pc = op[1]; return True
 
-        if isinstance(ins, BLabel):
-            return True
+    def _exec_iffalse(self, op: tuple) -> bool:
+        _, cond, target = op
+        if not self._is_true(self._get(cond)):
+            self.pc = target
+        return True
 
-        if isinstance(ins, BJmp):
-            self.pc = self.labels.get(ins.label, self.pc); return True
+    def _exec_iftrue(self, op: tuple) -> bool:
+        _, cond, target = op
+        if self._is_true(self._get(cond)):
+            self.pc = target
+        return True
 
-        if isinstance(ins, BIfFalse):
-            if not self._is_true(self._get(ins.cond)):
-                self.pc = self.labels.get(ins.label, self.pc)
-            return True
+    def _exec_mov(self, op: tuple) -> bool:
+        self._set(op[1], self._get(op[2])); return True
 
-        if isinstance(ins, BMov):
-            self._set(ins.dst, self._get(ins.src)); return True
-
-        if isinstance(ins, BUnary):
-            a = self._get(ins.src)
-            if ins.op == '!': v = 0.0 if self._is_true(a) else 1.0
-            elif ins.op == '+': v = +a
-            elif ins.op == '-': v = -a
-            else: raise RuntimeError(f"Unknown unary op {ins.op}")
-            self._set(ins.dst, v); return True
-
-        if isinstance(ins, BBin):
-            a = self._get(ins.left); b = self._get(ins.right); op = ins.op
-            if   op == '+': v = a + b
-            elif op == '-': v = a - b
-            elif op == '*': v = a * b
-            elif op == '/': v = a / b
-            elif op == '%': v = float(int(a) % int(b))
-            elif op == '<': v = 1.0 if a < b else 0.0
-            elif op == '<=': v = 1.0 if a <= b else 0.0
-            elif op == '>': v = 1.0 if a > b else 0.0
-            elif op == '>=': v = 1.0 if a >= b else 0.0
-            elif op == '==': v = 1.0 if a == b else 0.0
-            elif op == '!=': v = 1.0 if a != b else 0.0
-            elif op == '&&': v = 1.0 if (a != 0 and b != 0) else 0.0
-            elif op == '||': v = 1.0 if (a != 0 or b != 0) else 0.0
-            else: raise RuntimeError(f"Unknown bin op {op}")
-            self._set(ins.dst, v); return True
-
-        if isinstance(ins, BPrint):
-            self.output.append(self._fmt(self._get(ins.value))); return True
-
-        if isinstance(ins, BCall):
-            meta = self.func_meta.get(ins.name)
-            if meta is None:  # unknown func => no-op
-                return True
-            params = list(meta['params'])  # type: ignore
-            arg_vals = [self._get(a) for a in ins.args]
-            # push caller frame
-            self.stack.append(Frame(env=self.env, ret_pc=self.pc, ret_dst=ins.dst))
-            # new local env
-            self.env = {}
-            for i, p in enumerate(params):
-                self.env[p] = arg_vals[i] if i < len(arg_vals) else 0.0
-            # jump to first instruction after BFunc
-            self.pc = int(meta['start']) + 1  # type: ignore
-            return True
+    def _exec_unary(self, op: tuple) -> bool:
+        _, dst, uop, src = op
+        a = self._get(src)
+        if uop == '!': v = 0.0 if self._is_true(a) else 1.0
+        elif uop == '+': v = +a
+        elif uop == '-': v = -a
+        else: raise RuntimeError(f"Unknown unary op {uop}")
+        self._set(dst, v); return True
+
+    def _exec_bin(self, op: tuple) -> bool:
+        _, dst, bop, left, right = op
+        a = self._get(left); b = self._get(right)
+        if   bop == '+': v = a + b
+        elif bop == '-': v = a - b
+        elif bop == '*': v = a * b
+        elif bop == '/': v = a / b
+        elif bop == '%': v = float(int(a) % int(b))
+        elif bop == '<': v = 1.0 if a < b else 0.0
+        elif bop == '<=': v = 1.0 if a <= b else 0.0
+        elif bop == '>': v = 1.0 if a > b else 0.0
+        elif bop == '>=': v = 1.0 if a >= b else 0.0
+        elif bop == '==': v = 1.0 if a == b else 0.0
+        elif bop == '!=': v = 1.0 if a != b else 0.0
+        elif bop == '&&': v = 1.0 if (a != 0 and b != 0) else 0.0
+        elif bop == '||': v = 1.0 if (a != 0 or b != 0) else 0.0
+        else: raise RuntimeError(f"Unknown bin op {bop}")
+        self._set(dst, v); return True
 
-        if isinstance(ins, BRet):
-            if not self.stack:
-                # global RET -> end program (no extra line)
-                self.pc = self.n
-                return False
+    def _exec_print(self, op: tuple) -> bool:
+        self.output.append(self._fmt(self._get(op[1]))); return True
+
+    def _exec_ret(self, op: tuple) -> bool:
+        if not self.stack:
+            # global RET -> end program (no extra line)
+            self.pc = self.n
+            return False
+        frame = self.stack.pop()
+        value = op[1]
+        ret_val = self._get(value) if value is not None else 0.0
+        self.env = frame.env
+        if frame.ret_dst is not None:
+            self._set(frame.ret_dst, ret_val)
+        self.pc = frame.ret_pc
+        return True
+
+    def _exec_func(self, op: tuple) -> bool:
+        # Skip function bodies during global execution
+        if not self.stack:
+            self.pc = op[2]
+        return True  # inside a call we never land on BFunc
+
+    def _exec_endfunc(self, op: tuple) -> bool:
+        # Implicit return 0 when a function ends without RET
+        if self.stack:
             frame = self.stack.pop()
-            ret_val = self._get(ins.value) if ins.value is not None else 0.0
             self.env = frame.env
             if frame.ret_dst is not None:
-                self._set(frame.ret_dst, ret_val)
+                self._set(frame.ret_dst, 0.0)
             self.pc = frame.ret_pc
-            return True
+        return True
 
+    def _exec_call(self, op: tuple) -> bool:
+        _, dst, name, args = op
+        meta = self.func_meta.get(name)
+        if meta is None:  # unknown func => no-op
+            return True
+        params = meta['param_slots']
+        arg_vals = [self._get(a) for a in args]
+        # push caller frame
+        self.stack.append(Frame(env=self.env, ret_pc=self.pc, ret_dst=dst))
+        # new local env
+        env = self.env = [None] * len(self.global_env)
+        for i, p in enumerate(params):  # type: ignore
+            env[p] = arg_vals[i] if i < len(arg_vals) else 0.0
+        # jump to first instruction after BFunc
+        self.pc = int(meta['start']) + 1  # type: ignore
         return True
 
+    def step(self) -> bool:
+        if self.pc >= self.n: return False
+        op = self.ops[self.pc]; self.pc += 1
+        return self.handlers[op[0]](op)
+
     def run(self, max_steps=10000) -> str:
+        # step() inlined: one table dispatch per instruction, or one call per
+        # hot block while the whole block fits in the remaining step budget
+        ops, n, handlers, blocks = self.ops, self.n, self.handlers, self.blocks
         steps = 0
-        while self.step():
+        while self.pc < n:
+            pc = self.pc
+            blk = blocks[pc]
+            if blk is not None:
+                fn = blk.fn
+                if fn is None:
+                    blk.heat += 1
+                    if blk.heat >= _HOT:
+                        fn = blk.fn = self._compile_block(blk)
+                if fn is not None and steps + (blk.end - pc) <= max_steps:
+                    self.pc = fn(self.env)
+                    steps += blk.end - pc
+                    continue
+            op = ops[pc]; self.pc = pc + 1
+            if not handlers[op[0]](op):
+                break
             steps += 1
             if steps > max_steps:
                 self.output.append("[VM ERROR] Infinite loop detected or too many steps.")
@@ -1,7 +1,9 @@
 from typing import Dict
+from compiler_core.encoding import dumps_json
 from compiler_core.models import CompilationRun
 
 
 class CompilationRunRepository:
     def save_run(self, source: str, result_json: Dict):
-        return CompilationRun.objects.create(source=source, result_json=result_json)
+        # encode once and store the bytes as-is
+        return CompilationRun.objects.create(source=source, result_json=dumps_json(result_json))
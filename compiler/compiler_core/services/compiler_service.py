@@ -1,18 +1,78 @@
-from typing import List, Dict
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Tuple
 from compiler_core.logging import log_step
-from compiler_core.domain.tokens import Token
+from compiler_core.domain.tokens import Token, TokenType
 from compiler_core.domain.ast_nodes import ast_to_dict
 from compiler_core.pipeline.lexer import lex
 from compiler_core.pipeline import parser, semantics, ir, optimizer, codegen, peephole, vm
 from compiler_core.repositories.compilation_run_repository import CompilationRunRepository
 
 
+# Enum .name goes through a descriptor on every access; look names up once.
+_TOKEN_TYPE_NAMES: Dict[TokenType, str] = {tt: tt.name for tt in TokenType}
+
+
 def token_to_json(t: Token) -> Dict:
-    return {"type": t.type.name, "lexeme": t.lexeme, "line": t.line, "col": t.col}
+    return {"type": _TOKEN_TYPE_NAMES[t.type], "lexeme": t.lexeme, "line": t.line, "col": t.col}
+
+
+# Compiling is a pure function of the source text, so results are memoized
+# in-process, keyed by a digest of the source (LRU, bounded). Concurrent
+# requests for the same source wait on the first one instead of compiling
+# it again (_inflight holds an Event per key being compiled).
+_CACHE_SIZE = 256
+CacheKey = Tuple[bytes, bool, bool, bool]
+_cache: "OrderedDict[CacheKey, Dict]" = OrderedDict()
+_inflight: Dict[CacheKey, threading.Event] = {}
+_cache_lock = threading.Lock()
+
+
+def source_key(source: str) -> bytes:
+    # raw digest: no hex encoding, hashes as a short bytes key
+    return hashlib.blake2b(source.encode('utf-8'), digest_size=16).digest()
 
 
 class CompilerService:
-    def compile(self, source: str, persist: bool = False):
+    def compile(self, source: str, persist: bool = False, include_ast: bool = False,
+                include_typed_ast: bool = False, include_ir: bool = False):
+        # the optional sections change the result, so they are part of the key
+        key = (source_key(source), include_ast, include_typed_ast, include_ir)
+        while True:
+            with _cache_lock:
+                result = _cache.get(key)
+                if result is not None:
+                    _cache.move_to_end(key)
+                    break
+                pending = _inflight.get(key)
+                if pending is None:
+                    _inflight[key] = threading.Event()
+                    break
+            pending.wait()  # another thread is compiling this source
+
+        if result is None:
+            try:
+                result = self._compile(source, include_ast, include_typed_ast, include_ir)
+                with _cache_lock:
+                    _cache[key] = dict(result)  # the caller owns `result`
+                    if len(_cache) > _CACHE_SIZE:
+                        _cache.popitem(last=False)
+            finally:
+                # on failure waiters find no result and retry themselves
+                with _cache_lock:
+                    _inflight.pop(key).set()
+        else:
+            # shallow copy: callers never hold the cached dict, and the stage
+            # logs of the original run do not describe this request
+            log_step('Compile cache hit')
+            result = dict(result, stage_logs=['Compile cache hit'])
+
+        if persist:
+            CompilationRunRepository().save_run(source, result)
+        return result
+
+    def _compile(self, source: str, include_ast: bool, include_typed_ast: bool, include_ir: bool) -> Dict:
         logs: List[str] = []
         def emit(msg):
             log_step(msg); logs.append(msg)
@@ -20,20 +80,20 @@ class CompilerService:
         # 01 Lexing
         emit('01. Lexical analysis started')
         tokens_objs = lex(source)
-        tokens_json = [token_to_json(t) for t in tokens_objs]
+        names = _TOKEN_TYPE_NAMES
+        tokens_json = [{"type": names[t.type], "lexeme": t.lexeme, "line": t.line, "col": t.col}
+                       for t in tokens_objs]
         emit(f'01. Lexical analysis produced {len(tokens_json)} tokens')
 
         # 02 Parsing
         emit('02. Syntax analysis (parser) started')
         ast_root, parse_errors = parser.parse(tokens_objs)
-        ast_json = ast_to_dict(ast_root)
         emit(f'02. Syntax analysis done with {len(parse_errors)} error(s)')
 
         # 03 Semantics
         emit('03. Semantic analysis started')
         sem = semantics.analyze(ast_root)
         typed_root = sem['typed_root']
-        typed_json = sem['typed_json']
         emit(f"03. Semantic analysis done with {len(sem.get('errors', []))} error(s)")
 
         # 04 IR gen (stub)
@@ -70,16 +130,17 @@ class CompilerService:
             'stage_logs': logs,
             'errors': all_errors,
             'tokens': tokens_json,
-            'ast': ast_json,
-            'typed_ast': typed_json,
             'symbol_table': sem.get('symbol_table', {}),
-            'ir': [str(x) for x in ir_code],
-            'ir_optimized': [str(x) for x in ir_opt],
-            'bytecode': [str(x) for x in bytecode],
-            'bytecode_optimized': [str(x) for x in bytecode_opt],
+            'bytecode': list(map(str, bytecode)),
+            'bytecode_optimized': list(map(str, bytecode_opt)),
             'output': output,
         }
-
-        if persist:
-            CompilationRunRepository().save_run(source, result)
+        # optional sections: only serialized when the caller asks for them
+        if include_ast:
+            result['ast'] = ast_to_dict(ast_root)
+        if include_typed_ast:
+            result['typed_ast'] = sem['typed_json']
+        if include_ir:
+            result['ir'] = list(map(str, ir_code))
+            result['ir_optimized'] = list(map(str, ir_opt))
         return result
\ No newline at end of file
@@ -1,3 +1,168 @@
-from django.test import TestCase
+import json
+from unittest import mock
+from django.test import SimpleTestCase, TestCase
 
-# Create your tests here.
+from compiler_core.models import CompilationRun
+from compiler_core.pipeline import parser, semantics, ir, optimizer, codegen, peephole, vm
+from compiler_core.pipeline.lexer import lex
+from compiler_core.services.compiler_service import CompilerService
+
+BIG_INT_SOURCE = 'int x = 99999999999999999999; print(x);'
+# a float literal that overflows to inf next to an int orjson cannot encode
+INF_AND_BIG_INT_SOURCE = 'float a = 1' + '0' * 400 + '.0; int b = 1' + '0' * 30 + ';'
+
+
+def strict_loads(data: bytes):
+    # json.loads accepts Infinity/NaN unless told otherwise
+    def reject(token):
+        raise ValueError(f'not JSON: {token}')
+    return json.loads(data, parse_constant=reject)
+
+
+class PersistRunTests(TestCase):
+    def test_persist_encodes_int_beyond_64_bits(self):
+        CompilerService().compile(BIG_INT_SOURCE, persist=True, include_ast=True,
+                                  include_typed_ast=True, include_ir=True)
+        run = CompilationRun.objects.get()
+        stored = json.loads(bytes(run.result_json))
+        self.assertEqual(stored['ast']['body'][0]['init']['value'], 99999999999999999999)
+
+    def test_persist_encodes_inf_with_int_beyond_64_bits(self):
+        CompilerService().compile(INF_AND_BIG_INT_SOURCE, persist=True, include_ast=True,
+                                  include_typed_ast=True)
+        run = CompilationRun.objects.get()
+        stored = strict_loads(bytes(run.result_json))
+        body = stored['ast']['body']
+        self.assertIsNone(body[0]['init']['value'])
+        self.assertEqual(body[1]['init']['value'], 10 ** 30)
+
+
+def _bytecode(source: str):
+    ast_root, _ = parser.parse(lex(source))
+    typed_root = semantics.analyze(ast_root)['typed_root']
+    return peephole.peephole(codegen.codegen(optimizer.optimize_ir(ir.ir_gen(typed_root))))
+
+
+def _run(code, max_steps=10000):
+    machine = vm.VM(code)
+    return machine.run(max_steps), machine
+
+
+class HotBlockTests(SimpleTestCase):
+    # loops well past vm._HOT, so their bodies run as compiled blocks
+
+    def assert_same_as_interpreted(self, source, max_steps=10000):
+        code = _bytecode(source)
+        out, machine = _run(code, max_steps)
+        self.assertTrue(any(b is not None and b.fn is not None for b in machine.blocks))
+        with mock.patch.object(vm, '_HOT', float('inf')):
+            expected, plain = _run(code, max_steps)
+        self.assertFalse(any(b is not None and b.fn is not None for b in plain.blocks))
+        self.assertEqual(out, expected)
+        return out
+
+    def test_matches_interpreter(self):
+        out = self.assert_same_as_interpreted(
+            'int s = 0; int i = 0;'
+            'while (i < 200) { s = s + i * 2 - i % 3; if (i > 150) { print(s); } i = i + 1; }'
+            'print(s / 7);')
+        self.assertEqual(out.splitlines()[-1], str(sum(i * 2 - i % 3 for i in range(200)) / 7))
+
+    def test_step_budget_enforced_in_compiled_block(self):
+        out = self.assert_same_as_interpreted(
+            'int i = 0; while (1) { print(i); i = i + 1; }', max_steps=2000)
+        self.assertEqual(out.splitlines()[-1], '[VM ERROR] Infinite loop detected or too many steps.')
+
+    def test_unset_local_reads_global(self):
+        out = self.assert_same_as_interpreted(
+            'int g = 3;'
+            'int f(int n) { int s = 0; int i = 0; while (i < n) { s = s + g; i = i + 1; } return s; }'
+            'g = 5; print(f(100));')
+        self.assertEqual(out, '500')
+
+
+class CopyPropagationTests(SimpleTestCase):
+    def test_call_argument_temps_survive(self):
+        code = [
+            ir.FuncStart('f', ['n']), ir.ReturnInstr('n'), ir.FuncEnd('f'),
+            ir.AssignInstr('n', '7'),
+            ir.BinOp('t1', '-', 'n', '1'),
+            ir.CallInstr('t2', 'f', ['t1']),
+            ir.PrintInstr('t2'),
+        ]
+        opt = optimizer.optimize_ir(code)
+        call = next(i for i in opt if isinstance(i, ir.CallInstr))
+        (arg,) = call.args
+        self.assertTrue(optimizer.is_const(arg) or any(optimizer.defined_var(i) == arg for i in opt))
+        self.assertEqual(vm.run(codegen.codegen(opt)), '6')
+
+    def test_recursive_call_arguments(self):
+        code = _bytecode('int fact(int n) { if (n <= 1) { return 1; } return n * fact(n - 1); }'
+                         'print(fact(5));')
+        self.assertEqual(vm.run(code), '120')
+
+    def test_not_propagated_past_source_reassignment(self):
+        out = optimizer.copy_propagate([
+            ir.AssignInstr('x', 'y'),
+            ir.AssignInstr('y', '1'),
+            ir.PrintInstr('x'),
+        ])
+        self.assertEqual(out[-1], ir.PrintInstr('x'))
+
+    def test_not_propagated_across_labels_and_jumps(self):
+        out = optimizer.copy_propagate([
+            ir.AssignInstr('x', 'y'),
+            ir.IfFalse('c', 'L1'),
+            ir.AssignInstr('y', '2'),
+            ir.Goto('L2'),
+            ir.Label('L1'),
+            ir.PrintInstr('x'),
+            ir.Label('L2'),
+            ir.PrintInstr('x'),
+        ])
+        self.assertEqual(out[5], ir.PrintInstr('x'))
+        self.assertEqual(out[7], ir.PrintInstr('x'))
+
+    def test_propagated_within_block(self):
+        out = optimizer.copy_propagate([ir.AssignInstr('x', 'y'), ir.PrintInstr('x')])
+        self.assertEqual(out[-1], ir.PrintInstr('y'))
+
+
+class PeepholeControlFlowTests(SimpleTestCase):
+    def test_iffalse_over_jmp_becomes_iftrue(self):
+        out = peephole.invert_if_over_jmp([
+            codegen.BIfFalse('c', 'L1'), codegen.BJmp('L2'), codegen.BLabel('L1'),
+            codegen.BPrint('x'), codegen.BLabel('L2'),
+        ])
+        self.assertEqual(out, [codegen.BIfTrue('c', 'L2'), codegen.BPrint('x'), codegen.BLabel('L2')])
+
+    def test_iffalse_over_jmp_kept_when_label_targeted_elsewhere(self):
+        code = [
+            codegen.BIfFalse('c', 'L1'), codegen.BJmp('L2'), codegen.BLabel('L1'),
+            codegen.BPrint('x'), codegen.BJmp('L1'), codegen.BLabel('L2'),
+        ]
+        self.assertEqual(peephole.invert_if_over_jmp(code), code)
+
+    def test_code_after_jmp_kept_from_next_label(self):
+        out = peephole.remove_unreachable_after_jmp([
+            codegen.BJmp('L1'), codegen.BPrint('dead'), codegen.BMov('x', '1'),
+            codegen.BLabel('L1'), codegen.BPrint('x'),
+        ])
+        self.assertEqual(out, [codegen.BJmp('L1'), codegen.BLabel('L1'), codegen.BPrint('x')])
+
+    def test_iftrue_runs_like_iffalse_over_jmp(self):
+        code = _bytecode('int x = 2; if (x > 1) { } else { print(x); } print(7);')
+        self.assertIn(codegen.OP_IFTRUE, [ins.op_id for ins in code])
+        self.assertEqual(vm.run(code), '7')
+
+
+class CompileCacheTests(SimpleTestCase):
+    def test_cache_hit_returns_copy_with_own_stage_logs(self):
+        source = 'int cached = 41; print(cached + 1);'
+        first = CompilerService().compile(source)
+        first['output'] = 'changed by caller'
+        hit = CompilerService().compile(source)
+        self.assertEqual(hit['stage_logs'], ['Compile cache hit'])
+        self.assertEqual(hit['output'], '42')
+        self.assertIsNot(hit, CompilerService().compile(source))
+        self.assertTrue(first['stage_logs'][0].startswith('01.'))